@@ -1,5 +1,6 @@
 # File: break_overlay.py (GTK3 Version - Corrected Signal Emission & Dismiss Delay)
 import sys
+import logging
 import gi
 import time # Only for test delay
 
@@ -14,6 +15,90 @@ except ValueError as e:
 
 from gi.repository import Gtk, GLib, GObject, Gdk
 
+log = logging.getLogger(__name__)
+
+# --- Overlay styling (shared by all overlay windows) ---
+# Use a generic selector for the window now
+_CSS_STRING = """
+    window {
+        background-color: rgba(30, 30, 30, 0.85);
+    }
+    label {
+        color: white;
+        text-shadow: 1px 1px 2px black;
+        background-color: transparent;
+    }
+    label.overlay-title { font-size: 24pt; }
+    label.overlay-elapsed { font-size: 16pt; }
+    button.overlay-button {
+        font-size: 12pt; padding: 8px 16px; margin: 15px;
+        border-radius: 5px; background-image: none; background-color: #555;
+        color: white; border: 1px solid #777;
+        box-shadow: 1px 1px 3px rgba(0,0,0,0.4);
+    }
+    button.overlay-button:hover { background-color: #666; }
+    button.overlay-button:active { background-color: #444; }
+    /* Style for the 'Done' button to make it stand out */
+    button.overlay-button-done {
+        font-size: 16pt;
+        padding: 12px 24px;
+        background-color: #357EC7; /* A suggested action blue */
+    }
+    button.overlay-button-done:hover {
+        background-color: #4682B4;
+    }
+    button.overlay-button-done:active {
+        background-color: #2E6B9A;
+    }
+"""
+_CSS_BYTES = _CSS_STRING.encode('utf-8')
+_css_installed = False
+
+def _install_css_provider():
+    """Registers the overlay CSS for the default screen (once per process)."""
+    global _css_installed
+    if _css_installed:
+        return
+    provider = Gtk.CssProvider()
+    try:
+        provider.load_from_data(_CSS_BYTES)
+    except GLib.Error as e:
+        log.error("CSS Loading Error: %s", e)
+        return
+    Gtk.StyleContext.add_provider_for_screen(
+        Gdk.Screen.get_default(), provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
+    )
+    _css_installed = True
+
+
+class _MonitorGeomCache:
+    """
+    Caches the primary monitor geometry as (x, y, width, height) so overlays
+    don't query the X server each time. Invalidated on 'monitors-changed'.
+    """
+
+    def __init__(self):
+        self._geometry = None
+        self._screen = None
+
+    def get(self):
+        """Returns (x, y, width, height) of the primary monitor."""
+        if self._geometry is None:
+            screen = Gdk.Screen.get_default()
+            if self._screen is None:
+                screen.connect('monitors-changed', self._invalidate)
+                self._screen = screen
+            monitor_num = screen.get_primary_monitor()
+            rect = screen.get_monitor_geometry(monitor_num)
+            self._geometry = (rect.x, rect.y, rect.width, rect.height)
+        return self._geometry
+
+    def _invalidate(self, screen):
+        self._geometry = None
+
+_monitor_geom_cache = _MonitorGeomCache()
+
+
 class BreakOverlayWindow(Gtk.Window): # Inherit from Gtk.Window
     """
     A fullscreen, semi-transparent overlay window displayed during break time (GTK3).
@@ -29,12 +114,169 @@ class BreakOverlayWindow(Gtk.Window): # Inherit from Gtk.Window
     # Delay before buttons are enabled (in seconds)
     BUTTON_ENABLE_DELAY_SECONDS = 3
 
-    def __init__(self, width: int = 1000, height: int = 600, top_margin: int = 0, is_centered: bool = True, **kwargs):
-        """Initializes the BreakOverlayWindow."""
+    # With an idle monitor attached: seconds of renewed activity after the
+    # user went idle during the break before the break counts as done
+    AUTO_DISMISS_DELAY_SECONDS = 3
+
+    # Pre-formatted elapsed labels for the first hour, indexed by seconds
+    _ELAPSED_LABELS = tuple(
+        f"Break started: {m:02d}:{s:02d}" for m in range(60) for s in range(60)
+    )
+
+    # Static widget tree of the overlay, built in one pass by Gtk.Builder.
+    # The window itself and its positioning stay in Python.
+    _UI_XML = """
+<interface>
+  <object class="GtkEventBox" id="event_box">
+    <property name="visible">True</property>
+    <child>
+      <object class="GtkBox" id="main_box">
+        <property name="visible">True</property>
+        <property name="orientation">vertical</property>
+        <property name="spacing">20</property>
+        <property name="vexpand">True</property>
+        <property name="hexpand">True</property>
+        <property name="valign">center</property>
+        <property name="halign">center</property>
+        <child>
+          <object class="GtkBox" id="content_box">
+            <property name="visible">True</property>
+            <property name="orientation">vertical</property>
+            <property name="spacing">15</property>
+            <property name="valign">center</property>
+            <property name="halign">center</property>
+            <child>
+              <object class="GtkLabel" id="lbl_title">
+                <property name="visible">True</property>
+                <property name="use-markup">True</property>
+                <property name="label">&lt;span size='xx-large' weight='bold'&gt;Time for a break!&lt;/span&gt;</property>
+                <style><class name="overlay-title"/></style>
+              </object>
+              <packing>
+                <property name="expand">False</property>
+                <property name="fill">False</property>
+              </packing>
+            </child>
+            <child>
+              <object class="GtkLabel" id="lbl_elapsed_time">
+                <property name="visible">True</property>
+                <property name="label">Break started: 00:00</property>
+                <style><class name="overlay-elapsed"/></style>
+              </object>
+              <packing>
+                <property name="expand">False</property>
+                <property name="fill">False</property>
+              </packing>
+            </child>
+            <child>
+              <object class="GtkBox" id="button_box">
+                <property name="visible">True</property>
+                <property name="orientation">horizontal</property>
+                <property name="spacing">15</property>
+                <property name="halign">center</property>
+                <child>
+                  <object class="GtkButton" id="btn_postpone_5">
+                    <property name="visible">True</property>
+                    <property name="label">Postpone 5 min</property>
+                    <property name="sensitive">False</property>
+                    <style><class name="overlay-button"/></style>
+                  </object>
+                  <packing>
+                    <property name="expand">False</property>
+                    <property name="fill">False</property>
+                  </packing>
+                </child>
+                <child>
+                  <object class="GtkButton" id="btn_postpone_10">
+                    <property name="visible">True</property>
+                    <property name="label">Postpone 10 min</property>
+                    <property name="sensitive">False</property>
+                    <style><class name="overlay-button"/></style>
+                  </object>
+                  <packing>
+                    <property name="expand">False</property>
+                    <property name="fill">False</property>
+                  </packing>
+                </child>
+                <child>
+                  <object class="GtkButton" id="btn_postpone_20">
+                    <property name="visible">True</property>
+                    <property name="label">Postpone 20 min</property>
+                    <property name="sensitive">False</property>
+                    <style><class name="overlay-button"/></style>
+                  </object>
+                  <packing>
+                    <property name="expand">False</property>
+                    <property name="fill">False</property>
+                  </packing>
+                </child>
+                <child>
+                  <object class="GtkButton" id="btn_postpone_30">
+                    <property name="visible">True</property>
+                    <property name="label">Postpone 30 min</property>
+                    <property name="sensitive">False</property>
+                    <style><class name="overlay-button"/></style>
+                  </object>
+                  <packing>
+                    <property name="expand">False</property>
+                    <property name="fill">False</property>
+                  </packing>
+                </child>
+              </object>
+              <packing>
+                <property name="expand">False</property>
+                <property name="fill">False</property>
+                <property name="padding">15</property>
+              </packing>
+            </child>
+            <child>
+              <object class="GtkButton" id="btn_done">
+                <property name="visible">True</property>
+                <property name="label">Done</property>
+                <property name="sensitive">False</property>
+                <signal name="clicked" handler="_on_done_clicked"/>
+                <style>
+                  <class name="overlay-button"/>
+                  <class name="overlay-button-done"/>
+                </style>
+              </object>
+              <packing>
+                <property name="expand">False</property>
+                <property name="fill">False</property>
+                <property name="padding">15</property>
+              </packing>
+            </child>
+          </object>
+          <packing>
+            <property name="expand">False</property>
+            <property name="fill">False</property>
+          </packing>
+        </child>
+      </object>
+    </child>
+  </object>
+</interface>
+"""
+
+    # Postpone choices offered on the overlay (minutes); must match _UI_XML
+    POSTPONE_MINUTES = (5, 10, 20, 30)
+
+    def __init__(self, width: int = 1000, height: int = 600, top_margin: int = 0, is_centered: bool = True, idle_monitor=None, **kwargs):
+        """
+        Initializes the BreakOverlayWindow.
+
+        Args:
+            idle_monitor: Optional IdleMonitor. If given, the break ends by
+                          itself when the user comes back after going idle.
+        """
         super().__init__(**kwargs)
 
         self._elapsed_seconds = 0
         self._elapsed_timer_id = None
+        self._is_iconified = False
+        self._idle_monitor = idle_monitor
+        self._idle_active_handler_id = None
+        self._auto_dismiss_timer_id = None
 
         self.set_title("MindfulBreak - Take a Break!")
         self.set_decorated(False)
@@ -45,194 +287,179 @@ class BreakOverlayWindow(Gtk.Window): # Inherit from Gtk.Window
         self.set_default_size(width, height)
 
         # --- Position the window ---
-        screen = Gdk.Screen.get_default()
-        # Get geometry of the primary monitor
-        monitor_num = screen.get_primary_monitor()
-        monitor_geometry = screen.get_monitor_geometry(monitor_num)
+        if is_centered and top_margin == 0:
+            # No explicit margin: let GTK/the window manager center it
+            self.set_position(Gtk.WindowPosition.CENTER_ALWAYS)
+        else:
+            # Get geometry of the primary monitor (cached across overlays)
+            mon_x, mon_y, mon_width, mon_height = _monitor_geom_cache.get()
 
-        # Calculate position relative to the primary monitor,
-        # accounting for multi-monitor setups where the primary
-        # monitor might not start at (0, 0).
-        pos_y = top_margin + monitor_geometry.y
-        pos_x = monitor_geometry.x # Default to left edge of primary monitor
+            # Calculate position relative to the primary monitor,
+            # accounting for multi-monitor setups where the primary
+            # monitor might not start at (0, 0).
+            pos_y = top_margin + mon_y
+            pos_x = mon_x # Default to left edge of primary monitor
 
-        if is_centered:
-            pos_x = monitor_geometry.x + (monitor_geometry.width - width) // 2
+            if is_centered:
+                pos_x = mon_x + (mon_width - width) // 2
 
-        # Ensure position is within screen bounds as a fallback
-        pos_x = max(monitor_geometry.x, pos_x)
-        pos_y = max(monitor_geometry.y, pos_y)
+            # Ensure position is within screen bounds as a fallback
+            pos_x = max(mon_x, pos_x)
+            pos_y = max(mon_y, pos_y)
 
-        self.move(pos_x, pos_y)
+            self.move(pos_x, pos_y)
 
         # Set opacity (Ignoring deprecation warning)
-        try:
-            self.set_opacity(0.75)
-        except AttributeError:
-             print("Warning: set_opacity not available.", file=sys.stderr)
+        self.set_opacity(0.75)
 
-        # --- EventBox for background click detection ---
-        self.event_box = Gtk.EventBox()
+        # --- Build the widget tree (EventBox for background click detection,
+        # labels, postpone and Done buttons) from the UI definition ---
+        builder = Gtk.Builder.new_from_string(self._UI_XML, -1)
+        self.event_box = builder.get_object("event_box")
         self.add(self.event_box)
 
-        # --- Main Layout Box (Inside the EventBox) ---
-        main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=20)
-        main_box.set_vexpand(True)
-        main_box.set_hexpand(True)
-        main_box.set_valign(Gtk.Align.CENTER)
-        main_box.set_halign(Gtk.Align.CENTER)
-        self.event_box.add(main_box)
-
-        # --- Content Box (to group labels and buttons) ---
-        content_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=15)
-        content_box.set_valign(Gtk.Align.CENTER)
-        content_box.set_halign(Gtk.Align.CENTER)
-        main_box.pack_start(content_box, False, False, 0)
-
-        # --- Main Label ---
-        lbl_title = Gtk.Label()
-        lbl_title.set_markup("<span size='xx-large' weight='bold'>Time for a break!</span>")
-        lbl_title.get_style_context().add_class("overlay-title")
-        content_box.pack_start(lbl_title, False, False, 0)
-
-        # --- Elapsed Time Label ---
-        self.lbl_elapsed_time = Gtk.Label(label="Break started: 00:00")
-        self.lbl_elapsed_time.get_style_context().add_class("overlay-elapsed")
-        content_box.pack_start(self.lbl_elapsed_time, False, False, 0)
-
-        # --- Button Box ---
-        button_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=15)
-        button_box.set_halign(Gtk.Align.CENTER)
-        content_box.pack_start(button_box, False, False, 15)
-        self.action_buttons = []  # Store buttons to enable them later
-
-        # --- Postpone Buttons ---
-        # --- Create Postpone Buttons ---
-        for minutes in [5, 10, 20, 30]:
-            btn = Gtk.Button(label=f"Postpone {minutes} min")
+        self.lbl_elapsed_time = builder.get_object("lbl_elapsed_time")
+
+        # Buttons start insensitive; store them to enable them later
+        self.action_buttons = []
+        for minutes in self.POSTPONE_MINUTES:
+            btn = builder.get_object(f"btn_postpone_{minutes}")
+            # Postpone handlers need the minutes, so they're connected here
             btn.connect('clicked', self._on_postpone_clicked, minutes)
-            # Apply style and initial state consistently
-            btn.get_style_context().add_class("overlay-button")
-            btn.set_sensitive(False)
-            # Add to layout and list for later enabling
-            button_box.pack_start(btn, False, False, 0)
             self.action_buttons.append(btn)
+        self.action_buttons.append(builder.get_object("btn_done"))
+
+        # Connects the handlers named in _UI_XML (Done button)
+        builder.connect_signals(self)
+
+        # --- Apply CSS (no-op after the first overlay) ---
+        _install_css_provider()
+
+        # --- Refresh the label when the window becomes visible again ---
+        self.connect('map-event', self._on_map_event)
+        self.connect('window-state-event', self._on_window_state_event)
+
+        # --- End the break automatically when the user returns from idle ---
+        if self._idle_monitor is not None:
+            self._idle_active_handler_id = self._idle_monitor.connect('user_active', self._on_user_active)
+        self.connect('destroy', lambda w: self._disconnect_idle_monitor())
+
+        log.debug("BreakOverlayWindow (GTK3): Initialized.")
 
-        # --- Create Done Button ---
-        btn_done = Gtk.Button(label="Done")
-        btn_done.connect('clicked', self._on_done_clicked)
-        # Add both classes: base style and override style
-        btn_done.get_style_context().add_class("overlay-button")
-        btn_done.get_style_context().add_class("overlay-button-done")
-        btn_done.set_sensitive(False) # Also disable it initially
-        content_box.pack_start(btn_done, False, False, 15) # Add with margin
-        self.action_buttons.append(btn_done) # Add to the list to be enabled
-
-        # --- Apply CSS ---
-        self._apply_css()
-
-        print("BreakOverlayWindow (GTK3): Initialized.")
-
-
-    def _apply_css(self):
-        """Applies custom CSS for styling the overlay."""
-        provider = Gtk.CssProvider()
-        # Use a generic selector for the window now
-        css = """        
-        window {
-            background-color: rgba(30, 30, 30, 0.85);
-        }
-        label {
-            color: white;
-            text-shadow: 1px 1px 2px black;
-            background-color: transparent;
-        }
-        label.overlay-title { font-size: 24pt; }
-        label.overlay-elapsed { font-size: 16pt; }
-        button.overlay-button {
-            font-size: 12pt; padding: 8px 16px; margin: 15px;
-            border-radius: 5px; background-image: none; background-color: #555;
-            color: white; border: 1px solid #777;
-            box-shadow: 1px 1px 3px rgba(0,0,0,0.4);
-        }
-        button.overlay-button:hover { background-color: #666; }
-        button.overlay-button:active { background-color: #444; }
-        /* Style for the 'Done' button to make it stand out */
-        button.overlay-button-done {
-            font-size: 16pt;
-            padding: 12px 24px;
-            background-color: #357EC7; /* A suggested action blue */
-        }
-        button.overlay-button-done:hover {
-            background-color: #4682B4;
-        }
-        button.overlay-button-done:active {
-            background-color: #2E6B9A;
-        }
-        """
-        try:
-            provider.load_from_data(css.encode('utf-8'))
-        except GLib.Error as e:
-            print(f"CSS Loading Error: {e}", file=sys.stderr)
-            return
-        Gtk.StyleContext.add_provider_for_screen(
-            Gdk.Screen.get_default(), provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
-        )
 
     def show_and_start_elapsed_timer(self):
         """Makes the window visible, starts elapsed timer, and starts dismiss delay timer."""
-        print("BreakOverlayWindow: Showing and starting timers.")
+        log.debug("Showing and starting timers.")
         self._elapsed_seconds = 0
         self._update_elapsed_label()
 
         # --- Start timer to enable buttons ---
-        print(f"BreakOverlayWindow: Starting {self.BUTTON_ENABLE_DELAY_SECONDS}s button enable timer.")
+        log.debug("Starting %ss button enable timer.", self.BUTTON_ENABLE_DELAY_SECONDS)
         GLib.timeout_add_seconds(
             self.BUTTON_ENABLE_DELAY_SECONDS,
-            self._enable_buttons
+            self._enable_buttons,
+            priority=GLib.PRIORITY_DEFAULT_IDLE # Exact timing doesn't matter here
         )
 
         # Ensure previous elapsed timer is stopped if any
-        if self._elapsed_timer_id:
+        if self._elapsed_timer_id is not None:
             GLib.source_remove(self._elapsed_timer_id)
-        # Start elapsed timer
-        self._elapsed_timer_id = GLib.timeout_add_seconds(1, self._update_elapsed_timer)
+        # Start elapsed timer (low priority, seconds granularity so GLib can
+        # coalesce this wakeup with other once-per-second timers)
+        self._elapsed_timer_id = GLib.timeout_add_seconds(
+            1, self._update_elapsed_timer, priority=GLib.PRIORITY_LOW
+        )
 
-        self.show_all()
+        # Every child is built visible (see _UI_XML), so only the window
+        # itself needs showing; no recursive show_all() walk
+        self.show()
+        self.present_with_time(Gtk.get_current_event_time())
 
     def _enable_buttons(self):
         """Callback for the button delay timer. Enables all action buttons."""
-        print("BreakOverlayWindow: Delay ended. Enabling postpone buttons.")
+        log.debug("Delay ended. Enabling postpone buttons.")
         for btn in self.action_buttons:
             btn.set_sensitive(True)
         return GLib.SOURCE_REMOVE # Stop this timer
 
     def hide_and_stop_elapsed_timer(self):
         """Hides the window and stops the timers."""
-        print("BreakOverlayWindow: Hiding and stopping timers.")
-        if self._elapsed_timer_id:
+        log.debug("Hiding and stopping timers.")
+        if self._elapsed_timer_id is not None:
             GLib.source_remove(self._elapsed_timer_id)
             self._elapsed_timer_id = None
+        self._disconnect_idle_monitor()
 
         # Check if not already destroyed before calling destroy
         if hasattr(self, 'is_destroyed') and not self.is_destroyed():
-             print("BreakOverlayWindow: Calling self.destroy()")
+             log.debug("Calling self.destroy()")
              self.destroy()
         elif hasattr(self, 'props') and self.props.visible:
-             print("BreakOverlayWindow: Calling self.hide()")
+             log.debug("Calling self.hide()")
              self.hide()
         else:
-             print("BreakOverlayWindow: Already destroyed or being destroyed/hidden.")
+             log.debug("Already destroyed or being destroyed/hidden.")
+
+
+    def _on_user_active(self, idle_monitor):
+        """
+        The user came back after being idle during the break: enable the
+        buttons right away and finish the break after a short countdown.
+        """
+        if self._auto_dismiss_timer_id is not None:
+            return
+        log.info("User active after idle, ending break in %ss.", self.AUTO_DISMISS_DELAY_SECONDS)
+        self._enable_buttons()
+        self._auto_dismiss_timer_id = GLib.timeout_add_seconds(
+            self.AUTO_DISMISS_DELAY_SECONDS,
+            self._on_auto_dismiss
+        )
 
+    def _on_auto_dismiss(self):
+        """Callback for the auto-dismiss countdown. Ends the break like Done."""
+        self._auto_dismiss_timer_id = None
+        log.info("Break completed (user returned from idle).")
+        self.emit('dismissed')
+        self.hide_and_stop_elapsed_timer()
+        return GLib.SOURCE_REMOVE # Stop this timer
+
+    def _disconnect_idle_monitor(self):
+        """Drops the idle monitor hookup and any pending auto-dismiss."""
+        if self._auto_dismiss_timer_id is not None:
+            GLib.source_remove(self._auto_dismiss_timer_id)
+            self._auto_dismiss_timer_id = None
+        if self._idle_active_handler_id is not None:
+            self._idle_monitor.disconnect(self._idle_active_handler_id)
+            self._idle_active_handler_id = None
 
     def _update_elapsed_timer(self) -> bool:
         """Internal callback to update the elapsed time label."""
         self._elapsed_seconds += 1
+        # Keep counting, but don't touch the label while nobody can see it
+        if not self.get_mapped() or self._is_iconified:
+            return True
         self._update_elapsed_label()
         return True # Keep timer running
 
+    def _on_map_event(self, widget, event):
+        """Brings the label up to date after the window is (re)mapped."""
+        self._update_elapsed_label()
+        return False # Let other handlers run
+
+    def _on_window_state_event(self, widget, event):
+        """Tracks minimize state and refreshes the label when restored."""
+        was_iconified = self._is_iconified
+        self._is_iconified = bool(event.new_window_state & Gdk.WindowState.ICONIFIED)
+        if was_iconified and not self._is_iconified:
+            self._update_elapsed_label()
+        return False # Let other handlers run
+
     def _update_elapsed_label(self):
         """Formats seconds into MM:SS and updates the label."""
+        if self._elapsed_seconds < len(self._ELAPSED_LABELS):
+            self.lbl_elapsed_time.set_label(self._ELAPSED_LABELS[self._elapsed_seconds])
+            return
+        # Breaks longer than an hour fall back to formatting on the fly
         minutes = self._elapsed_seconds // 60
         seconds = self._elapsed_seconds % 60
         time_str = f"{minutes:02d}:{seconds:02d}"
@@ -242,19 +469,20 @@ class BreakOverlayWindow(Gtk.Window): # Inherit from Gtk.Window
         """
         Handles clicks on the postpone buttons. Works immediately.
         """
-        print(f"BreakOverlayWindow: Postpone {minutes} min clicked.")
+        log.info("Postpone %s min clicked.", minutes)
         self.emit('postponed', minutes) # Emit signal BEFORE destroy
         self.hide_and_stop_elapsed_timer()
 
     def _on_done_clicked(self, button):
         """Handles click on the Done button."""
-        print("BreakOverlayWindow: Done clicked.")
+        log.info("Done clicked.")
         self.emit('dismissed')        
         self.hide_and_stop_elapsed_timer()
 
 
 # --- Test Code (GTK3 - Modified for delay test) ---
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG, format="%(name)s: %(message)s")
     print("Running BreakOverlayWindow Test (GTK3 Version with Dismiss Delay)...")
 
     main_loop = GLib.MainLoop()
@@ -1,7 +1,9 @@
 # File: idle_monitor.py
 import sys
+import logging
 import ctypes
 import ctypes.util
+import functools
 import time # For testing delays
 
 import gi
@@ -14,6 +16,8 @@ except ValueError as e:
 
 from gi.repository import GLib, GObject
 
+log = logging.getLogger(__name__)
+
 # --- ctypes definitions for X11 and XScreenSaver ---
 
 # Basic X11 types
@@ -33,57 +37,237 @@ class XScreenSaverInfo(ctypes.Structure):
         ('eventMask', ctypes.c_ulong)  # events
     ]
 
-# Find libraries
-libX11_path = ctypes.util.find_library('X11')
-libXss_path = ctypes.util.find_library('Xss') # Usually libXss.so.1
+# XErrorEvent struct based on <X11/Xlib.h>
+class XErrorEvent(ctypes.Structure):
+    _fields_ = [
+        ('type', ctypes.c_int),
+        ('display', Display),          # Display the event was read from
+        ('resourceid', XID),           # resource id
+        ('serial', ctypes.c_ulong),    # serial number of failed request
+        ('error_code', ctypes.c_ubyte),
+        ('request_code', ctypes.c_ubyte),
+        ('minor_code', ctypes.c_ubyte)
+    ]
 
-if not libX11_path:
-    raise ImportError("Could not find libX11. System library missing?")
-if not libXss_path:
-    raise ImportError("Could not find libXss. Is libxss1 installed?")
+# int (*XErrorHandler)(Display *, XErrorEvent *)
+XErrorHandler = ctypes.CFUNCTYPE(ctypes.c_int, Display, ctypes.POINTER(XErrorEvent))
 
-# Load libraries
-try:
-    libX11 = ctypes.CDLL(libX11_path)
-    libXss = ctypes.CDLL(libXss_path)
-except OSError as e:
-     raise ImportError(f"Error loading X11/Xss libraries: {e}")
+# --- ctypes definitions for the X Sync extension (IDLETIME counter) ---
+
+XSyncCounter = XID
+XSyncAlarm = XID
+
+# 64-bit counter value split into two halves, see <X11/extensions/sync.h>
+class XSyncValue(ctypes.Structure):
+    _fields_ = [
+        ('hi', ctypes.c_int),
+        ('lo', ctypes.c_uint)
+    ]
+
+class XSyncTrigger(ctypes.Structure):
+    _fields_ = [
+        ('counter', XSyncCounter),     # counter to watch (IDLETIME)
+        ('value_type', ctypes.c_int),  # XSyncAbsolute or XSyncRelative
+        ('wait_value', XSyncValue),    # value the test compares against
+        ('test_type', ctypes.c_int)    # XSyncPositiveTransition, ...
+    ]
+
+class XSyncAlarmAttributes(ctypes.Structure):
+    _fields_ = [
+        ('trigger', XSyncTrigger),
+        ('delta', XSyncValue),
+        ('events', ctypes.c_int),      # Bool: deliver XSyncAlarmNotify events
+        ('state', ctypes.c_int)        # XSyncAlarmActive, Inactive, Destroyed
+    ]
+
+class XSyncSystemCounter(ctypes.Structure):
+    _fields_ = [
+        ('name', ctypes.c_char_p),
+        ('counter', XSyncCounter),
+        ('resolution', XSyncValue)
+    ]
+
+class XSyncAlarmNotifyEvent(ctypes.Structure):
+    _fields_ = [
+        ('type', ctypes.c_int),
+        ('serial', ctypes.c_ulong),
+        ('send_event', ctypes.c_int),
+        ('display', Display),
+        ('alarm', XSyncAlarm),
+        ('counter_value', XSyncValue),
+        ('alarm_value', XSyncValue),
+        ('time', ctypes.c_ulong),
+        ('state', ctypes.c_int)
+    ]
+
+# XEvent is a union padded to 24 longs; we only ever look at alarm events
+class XEvent(ctypes.Union):
+    _fields_ = [
+        ('type', ctypes.c_int),
+        ('xsyncalarm', XSyncAlarmNotifyEvent),
+        ('pad', ctypes.c_long * 24)
+    ]
+
+# Alarm attribute masks
+XSyncCACounter = 1 << 0
+XSyncCAValueType = 1 << 1
+XSyncCAValue = 1 << 2
+XSyncCATestType = 1 << 3
+XSyncCADelta = 1 << 4
+XSyncCAEvents = 1 << 5
+XSYNC_ALARM_MASK = (XSyncCACounter | XSyncCAValueType | XSyncCAValue |
+                    XSyncCATestType | XSyncCADelta | XSyncCAEvents)
+
+XSyncAbsolute = 0
+XSyncPositiveTransition = 0
+XSyncNegativeTransition = 1
+XSyncAlarmNotify = 1 # Offset from the extension's event base
+
+
+@functools.lru_cache(maxsize=1)
+def _load_x_libs():
+    """
+    Loads libX11/libXss/libXext and declares the prototypes we use.
+
+    Deferred until the first IdleMonitor is created so that importing this
+    module never touches the X libraries (e.g. on Wayland-only systems).
+
+    Returns:
+        tuple: (libX11, libXss, libXext) ctypes library handles.
+
+    Raises:
+        ImportError: If a library can't be found or loaded.
+    """
+    # Find libraries
+    libX11_path = ctypes.util.find_library('X11')
+    libXss_path = ctypes.util.find_library('Xss') # Usually libXss.so.1
+    libXext_path = ctypes.util.find_library('Xext') # Provides the XSync client calls
+
+    if not libX11_path:
+        raise ImportError("Could not find libX11. System library missing?")
+    if not libXss_path:
+        raise ImportError("Could not find libXss. Is libxss1 installed?")
+    if not libXext_path:
+        raise ImportError("Could not find libXext. System library missing?")
+
+    # Load libraries
+    try:
+        libX11 = ctypes.CDLL(libX11_path)
+        libXss = ctypes.CDLL(libXss_path)
+        libXext = ctypes.CDLL(libXext_path)
+    except OSError as e:
+         raise ImportError(f"Error loading X11/Xss/Xext libraries: {e}")
+
+
+    # Define function prototypes we need using ctypes
 
+    # XOpenDisplay = (display_name) -> Display*
+    libX11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+    libX11.XOpenDisplay.restype = Display
 
-# Define function prototypes we need using ctypes
+    # XCloseDisplay = (display) -> int
+    libX11.XCloseDisplay.argtypes = [Display]
+    libX11.XCloseDisplay.restype = ctypes.c_int
 
-# XOpenDisplay = (display_name) -> Display*
-libX11.XOpenDisplay.argtypes = [ctypes.c_char_p]
-libX11.XOpenDisplay.restype = Display
+    # XDefaultRootWindow = (display) -> Window
+    libX11.XDefaultRootWindow.argtypes = [Display]
+    libX11.XDefaultRootWindow.restype = Window
 
-# XCloseDisplay = (display) -> int
-libX11.XCloseDisplay.argtypes = [Display]
-libX11.XCloseDisplay.restype = ctypes.c_int
+    # XScreenSaverAllocInfo = () -> XScreenSaverInfo*
+    libXss.XScreenSaverAllocInfo.argtypes = []
+    libXss.XScreenSaverAllocInfo.restype = ctypes.POINTER(XScreenSaverInfo)
 
-# XDefaultRootWindow = (display) -> Window
-libX11.XDefaultRootWindow.argtypes = [Display]
-libX11.XDefaultRootWindow.restype = Window
+    # XScreenSaverQueryExtension = (display, event_base_return, error_base_return) -> Bool
+    libXss.XScreenSaverQueryExtension.argtypes = [Display, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)]
+    libXss.XScreenSaverQueryExtension.restype = ctypes.c_int
 
-# XScreenSaverAllocInfo = () -> XScreenSaverInfo*
-libXss.XScreenSaverAllocInfo.argtypes = []
-libXss.XScreenSaverAllocInfo.restype = ctypes.POINTER(XScreenSaverInfo)
+    # XScreenSaverQueryInfo = (display, drawable, saver_info) -> int
+    libXss.XScreenSaverQueryInfo.argtypes = [Display, Drawable, ctypes.POINTER(XScreenSaverInfo)]
+    libXss.XScreenSaverQueryInfo.restype = ctypes.c_int
 
-# XScreenSaverQueryInfo = (display, drawable, saver_info) -> int
-libXss.XScreenSaverQueryInfo.argtypes = [Display, Drawable, ctypes.POINTER(XScreenSaverInfo)]
-libXss.XScreenSaverQueryInfo.restype = ctypes.c_int
+    # XFree = (data) -> int (usually returns void, but ctypes default is int)
+    libX11.XFree.argtypes = [ctypes.c_void_p]
+    libX11.XFree.restype = ctypes.c_int
+
+    # XSetErrorHandler = (handler) -> previous handler
+    libX11.XSetErrorHandler.argtypes = [XErrorHandler]
+    libX11.XSetErrorHandler.restype = XErrorHandler
+
+    # XConnectionNumber = (display) -> int (socket fd of the connection)
+    libX11.XConnectionNumber.argtypes = [Display]
+    libX11.XConnectionNumber.restype = ctypes.c_int
+
+    # XPending = (display) -> int (number of queued events, flushes output)
+    libX11.XPending.argtypes = [Display]
+    libX11.XPending.restype = ctypes.c_int
+
+    # XNextEvent = (display, event_return) -> int
+    libX11.XNextEvent.argtypes = [Display, ctypes.POINTER(XEvent)]
+    libX11.XNextEvent.restype = ctypes.c_int
+
+    # XFlush = (display) -> int
+    libX11.XFlush.argtypes = [Display]
+    libX11.XFlush.restype = ctypes.c_int
+
+    # XSyncQueryExtension = (display, event_base_return, error_base_return) -> Bool
+    libXext.XSyncQueryExtension.argtypes = [Display, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)]
+    libXext.XSyncQueryExtension.restype = ctypes.c_int
+
+    # XSyncInitialize = (display, major_return, minor_return) -> Status
+    libXext.XSyncInitialize.argtypes = [Display, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)]
+    libXext.XSyncInitialize.restype = ctypes.c_int
+
+    # XSyncListSystemCounters = (display, n_counters_return) -> XSyncSystemCounter*
+    libXext.XSyncListSystemCounters.argtypes = [Display, ctypes.POINTER(ctypes.c_int)]
+    libXext.XSyncListSystemCounters.restype = ctypes.POINTER(XSyncSystemCounter)
+
+    # XSyncFreeSystemCounterList = (list) -> void
+    libXext.XSyncFreeSystemCounterList.argtypes = [ctypes.POINTER(XSyncSystemCounter)]
+    libXext.XSyncFreeSystemCounterList.restype = None
+
+    # XSyncQueryCounter = (display, counter, value_return) -> Status
+    libXext.XSyncQueryCounter.argtypes = [Display, XSyncCounter, ctypes.POINTER(XSyncValue)]
+    libXext.XSyncQueryCounter.restype = ctypes.c_int
+
+    # XSyncCreateAlarm = (display, values_mask, values) -> XSyncAlarm
+    libXext.XSyncCreateAlarm.argtypes = [Display, ctypes.c_ulong, ctypes.POINTER(XSyncAlarmAttributes)]
+    libXext.XSyncCreateAlarm.restype = XSyncAlarm
+
+    # XSyncChangeAlarm = (display, alarm, values_mask, values) -> Status
+    libXext.XSyncChangeAlarm.argtypes = [Display, XSyncAlarm, ctypes.c_ulong, ctypes.POINTER(XSyncAlarmAttributes)]
+    libXext.XSyncChangeAlarm.restype = ctypes.c_int
+
+    # XSyncDestroyAlarm = (display, alarm) -> Status
+    libXext.XSyncDestroyAlarm.argtypes = [Display, XSyncAlarm]
+    libXext.XSyncDestroyAlarm.restype = ctypes.c_int
+
+    return libX11, libXss, libXext
+
+
+def _ms_to_sync_value(ms: int) -> XSyncValue:
+    """Packs a millisecond count into an XSyncValue (hi/lo halves)."""
+    return XSyncValue(hi=(ms >> 32), lo=(ms & 0xFFFFFFFF))
+
+def _sync_value_to_ms(value: XSyncValue) -> int:
+    """Unpacks an XSyncValue into a plain millisecond count."""
+    return (value.hi << 32) | value.lo
 
-# XFree = (data) -> int (usually returns void, but ctypes default is int)
-libX11.XFree.argtypes = [ctypes.c_void_p]
-libX11.XFree.restype = ctypes.c_int
 
 # --- IdleMonitor Class ---
 
 class IdleMonitor(GObject.Object):
     """
-    Monitors user idle time using the XScreenSaver extension and emits signals
-    when the user becomes idle or active after being idle.
+    Monitors user idle time and emits signals when the user becomes idle or
+    active after being idle.
+
+    Idle detection is event-driven: two X Sync alarms are placed on the server's
+    IDLETIME counter (one firing when idle time crosses the threshold, one when
+    it drops back below it) and the X connection is watched from the GLib main
+    loop, so nothing runs until a transition actually happens. If the X Sync
+    extension or the IDLETIME counter is unavailable, the monitor falls back to
+    polling the XScreenSaver extension.
 
-    Note: This relies on the X11 ScreenSaver extension and will likely not work
+    Note: This relies on X11 extensions and will likely not work
     correctly under native Wayland sessions unless running via XWayland and
     the compositor supports the necessary XWayland extensions.
     """
@@ -92,7 +276,94 @@ class IdleMonitor(GObject.Object):
         'user_active': (GObject.SignalFlags.RUN_FIRST, None, ()),
     }
 
+    # Polling fallback only: retry interval after a failed check
     DEFAULT_POLL_INTERVAL_SECONDS = 30
+    # Polling fallback only: interval used while idle to catch activity quickly
+    IDLE_POLL_INTERVAL_SECONDS = 2
+
+    # X resources shared by all instances: opening a display is expensive
+    # (auth handshake), and one connection per process is enough.
+    # Reference-counted; released when the last instance calls stop().
+    _shared_display = None
+    _shared_saver_info = None
+    _shared_refcount = 0
+    # XSyncAlarm id -> owning instance, so any instance draining the shared
+    # connection can route alarm events to the right monitor
+    _alarm_owners = {}
+
+    # Process-wide X error handler (installed once) and the handler it
+    # replaced, which still receives errors for other connections (GDK)
+    _x_error_handler = None
+    _previous_x_error_handler = None
+    # Set by the handler when an error arrives on the shared connection;
+    # the idle paths check it instead of inspecting each call's status
+    _x_error_seen = False
+
+    @classmethod
+    def _acquire_shared_x_resources(cls, libX11, libXss):
+        """
+        Opens the shared X display and XScreenSaverInfo buffer on first use.
+
+        Returns:
+            tuple: (display, saver_info) shared by all instances.
+        """
+        if cls._shared_refcount == 0:
+            # Open connection to the X server
+            # Passing None uses the DISPLAY environment variable
+            display = libX11.XOpenDisplay(None)
+            if not display:
+                raise RuntimeError("Could not open X Display. Is DISPLAY set correctly?")
+
+            # Allocate the structure to store query results
+            saver_info = libXss.XScreenSaverAllocInfo()
+            if not saver_info:
+                libX11.XCloseDisplay(display)
+                raise RuntimeError("Could not allocate XScreenSaverInfo struct.")
+
+            cls._shared_display = display
+            cls._shared_saver_info = saver_info
+            cls._x_error_seen = False
+            cls._install_x_error_handler(libX11)
+        cls._shared_refcount += 1
+        return cls._shared_display, cls._shared_saver_info
+
+    @classmethod
+    def _release_shared_x_resources(cls, libX11):
+        """Drops one reference; frees the shared X resources on the last one."""
+        cls._shared_refcount -= 1
+        if cls._shared_refcount > 0:
+            return
+        try:
+            libX11.XFree(cls._shared_saver_info)
+        except Exception as e:
+            log.warning("Error freeing XScreenSaverInfo: %s", e)
+        libX11.XCloseDisplay(cls._shared_display)
+        cls._shared_saver_info = None
+        cls._shared_display = None
+        cls._shared_refcount = 0
+
+    @classmethod
+    def _install_x_error_handler(cls, libX11):
+        """Routes X errors to _on_x_error (installed once per process)."""
+        if cls._x_error_handler is not None:
+            return
+        # Keep a reference to the ctypes callback so it isn't collected
+        cls._x_error_handler = XErrorHandler(cls._on_x_error)
+        cls._previous_x_error_handler = libX11.XSetErrorHandler(cls._x_error_handler)
+
+    @classmethod
+    def _on_x_error(cls, display, event) -> int:
+        """X error handler: flags errors on our connection, chains the rest."""
+        if display != cls._shared_display:
+            # Not our connection (e.g. GDK's): let its own handler decide
+            if cls._previous_x_error_handler:
+                return cls._previous_x_error_handler(display, event)
+            return 0
+        error = event.contents
+        log.error("X error on idle monitor connection (error_code=%s, request_code=%s).",
+                  error.error_code, error.request_code)
+        cls._x_error_seen = True
+        return 0
 
     def __init__(self, idle_threshold_seconds: int):
         """
@@ -105,152 +376,388 @@ class IdleMonitor(GObject.Object):
         GObject.Object.__init__(self)
 
         if idle_threshold_seconds < 1:
-            print("Warning: Idle threshold must be at least 1 second. Setting to 1.", file=sys.stderr)
+            log.warning("Idle threshold must be at least 1 second. Setting to 1.")
             idle_threshold_seconds = 1
         self._idle_threshold_ms = idle_threshold_seconds * 1000
 
         self._is_idle = False # Current state
-        self._timer_source_id = None
+        self._timer_source_id = None # Fallback polling timer (no XSync)
+        self._poll_interval_seconds = None # Optional cap on the polling gap
+        self._x_source_id = None # GLib watch on the X connection fd
         self._display = None
         self._root_window = None
         self._saver_info = None
+        self._saver_info_contents = None
+        self._xss_query = None
+        self._xss_query_args = None
         self._initialized_successfully = False
 
+        # X Sync state (only used when the extension is available)
+        self._sync_available = False
+        self._sync_event_base = 0
+        self._idletime_counter = None
+        self._idle_alarm = None  # PositiveTransition at threshold
+        self._reset_alarm = None # NegativeTransition at threshold - 1
+        self._x_event = XEvent()
+
+        self._libX11 = None
+        self._libXss = None
+        self._libXext = None
+
         try:
-            # Open connection to the X server
-            # Passing None uses the DISPLAY environment variable
-            self._display = libX11.XOpenDisplay(None)
-            if not self._display:
-                raise RuntimeError("Could not open X Display. Is DISPLAY set correctly?")
+            # Load the X libraries on first use (raises ImportError if missing)
+            self._libX11, self._libXss, self._libXext = _load_x_libs()
+
+            # Display connection and query buffer are shared between instances
+            self._display, self._saver_info = self._acquire_shared_x_resources(self._libX11, self._libXss)
 
             # Get the root window
-            self._root_window = libX11.XDefaultRootWindow(self._display)
+            self._root_window = self._libX11.XDefaultRootWindow(self._display)
             if not self._root_window:
-                libX11.XCloseDisplay(self._display)
                 raise RuntimeError("Could not get default root window.")
-
-            # Allocate the structure to store query results
-            self._saver_info = libXss.XScreenSaverAllocInfo()
-            if not self._saver_info:
-                libX11.XCloseDisplay(self._display)
-                raise RuntimeError("Could not allocate XScreenSaverInfo struct.")
-
-            print(f"IdleMonitor: Initialized successfully. Threshold: {idle_threshold_seconds}s")
+            # Cache the bound query function and the struct it fills so the
+            # polling path doesn't re-resolve them on every check
+            self._xss_query = self._libXss.XScreenSaverQueryInfo
+            # Bind a struct view straight to the C buffer's address, so
+            # reading .idle never goes through a POINTER dereference
+            self._saver_info_contents = XScreenSaverInfo.from_address(
+                ctypes.cast(self._saver_info, ctypes.c_void_p).value
+            )
+            # Pre-built ctypes arguments; ctypes passes these through as-is
+            # instead of converting Python ints on every call
+            self._xss_query_args = (Display(self._display), Drawable(self._root_window), self._saver_info)
+
+            # Prefer event-driven alarms; polling is only the fallback
+            self._sync_available = self._setup_sync_alarms()
+            if not self._sync_available:
+                # Without the extension XScreenSaverQueryInfo fails without an
+                # X error and never updates the idle time, so check it once here
+                event_base, error_base = ctypes.c_int(), ctypes.c_int()
+                if not self._libXss.XScreenSaverQueryExtension(
+                        self._display, ctypes.byref(event_base), ctypes.byref(error_base)):
+                    raise RuntimeError("Neither X Sync IDLETIME nor the MIT-SCREEN-SAVER extension is available.")
+                log.warning("X Sync IDLETIME unavailable, falling back to XScreenSaver polling.")
+
+            log.info("Initialized successfully. Threshold: %ss", idle_threshold_seconds)
             self._initialized_successfully = True
 
         except (ImportError, RuntimeError, AttributeError) as e:
             # AttributeError can happen if a required X function isn't found
-            print(f"Error initializing IdleMonitor (X11/Xss): {e}", file=sys.stderr)
-            print("Idle monitoring will be disabled.", file=sys.stderr)
+            log.error("Error initializing IdleMonitor (X11/Xss): %s. Idle monitoring will be disabled.", e)
             # Ensure cleanup if partially initialized
-            if self._saver_info:
-                # XFree works even if display wasn't fully opened? Let's try.
-                # Might need a specific function for freeing XScreenSaverInfo?
-                # Docs suggest XFree is correct.
-                 try:
-                      libX11.XFree(self._saver_info)
-                 except Exception as free_e:
-                      print(f"Warning: Error during cleanup free: {free_e}", file=sys.stderr)
-                 self._saver_info = None
             if self._display:
-                 libX11.XCloseDisplay(self._display)
+                 self._release_shared_x_resources(self._libX11)
                  self._display = None
+                 self._saver_info = None
+
+
+    def _setup_sync_alarms(self) -> bool:
+        """
+        Locates the IDLETIME system counter and creates the two idle alarms.
+
+        Returns:
+            bool: True if the alarms were created, False if X Sync (or the
+                  IDLETIME counter) is not available on this server.
+        """
+        event_base = ctypes.c_int()
+        error_base = ctypes.c_int()
+        if not self._libXext.XSyncQueryExtension(self._display, ctypes.byref(event_base), ctypes.byref(error_base)):
+            return False
+        major = ctypes.c_int()
+        minor = ctypes.c_int()
+        if not self._libXext.XSyncInitialize(self._display, ctypes.byref(major), ctypes.byref(minor)):
+            return False
+        self._sync_event_base = event_base.value
+
+        # Find the IDLETIME counter among the server's system counters
+        n_counters = ctypes.c_int()
+        counters = self._libXext.XSyncListSystemCounters(self._display, ctypes.byref(n_counters))
+        if not counters:
+            return False
+        try:
+            for i in range(n_counters.value):
+                if counters[i].name == b"IDLETIME":
+                    self._idletime_counter = counters[i].counter
+                    break
+        finally:
+            self._libXext.XSyncFreeSystemCounterList(counters)
+
+        if self._idletime_counter is None:
+            return False
+
+        self._idle_alarm = self._set_alarm(None, XSyncPositiveTransition, self._idle_threshold_ms)
+        self._reset_alarm = self._set_alarm(None, XSyncNegativeTransition, self._idle_threshold_ms - 1)
+        self._libX11.XFlush(self._display)
+        IdleMonitor._alarm_owners[self._idle_alarm] = self
+        IdleMonitor._alarm_owners[self._reset_alarm] = self
+        return bool(self._idle_alarm and self._reset_alarm)
 
 
-    def start(self, poll_interval_seconds: int = DEFAULT_POLL_INTERVAL_SECONDS):
+    def _set_alarm(self, alarm, test_type: int, wait_ms: int):
         """
-        Starts the periodic polling for idle time.
+        Creates (alarm=None) or re-arms an alarm on the IDLETIME counter.
+
+        Returns:
+            The XSyncAlarm id of the created/changed alarm.
+        """
+        attrs = XSyncAlarmAttributes()
+        attrs.trigger.counter = self._idletime_counter
+        attrs.trigger.value_type = XSyncAbsolute
+        attrs.trigger.wait_value = _ms_to_sync_value(wait_ms)
+        attrs.trigger.test_type = test_type
+        attrs.delta = _ms_to_sync_value(0)
+        attrs.events = 1
+
+        if alarm is None:
+            return self._libXext.XSyncCreateAlarm(self._display, XSYNC_ALARM_MASK, ctypes.byref(attrs))
+        self._libXext.XSyncChangeAlarm(self._display, alarm, XSYNC_ALARM_MASK, ctypes.byref(attrs))
+        return alarm
+
+
+    def start(self, poll_interval_seconds: int = None):
+        """
+        Starts idle monitoring.
+
+        With X Sync available this only attaches the X connection to the GLib
+        main loop; otherwise it starts periodic XScreenSaver polling.
 
         Args:
-            poll_interval_seconds: How often to check for idle time.
+            poll_interval_seconds: Optional longest gap between idle time
+                                   checks when falling back to polling. By
+                                   default a check sleeps until the earliest
+                                   moment the user could cross the threshold.
         """
         if not self._initialized_successfully:
-             print("IdleMonitor: Cannot start, initialization failed.", file=sys.stderr)
+             log.error("Cannot start, initialization failed.")
              return
 
-        if self._timer_source_id:
-            print("IdleMonitor: Already running.", file=sys.stderr)
+        if self._timer_source_id is not None or self._x_source_id is not None:
+            log.warning("Already running.")
+            return
+
+        if self._sync_available:
+            log.info("Starting event-driven monitoring (X Sync IDLETIME alarms).")
+            # Report the current state once; the alarms only fire on transitions
+            current_value = XSyncValue()
+            if self._libXext.XSyncQueryCounter(self._display, self._idletime_counter, ctypes.byref(current_value)):
+                self._set_idle_state(_sync_value_to_ms(current_value) >= self._idle_threshold_ms)
+            self._x_source_id = GLib.unix_fd_add_full(
+                GLib.PRIORITY_DEFAULT,
+                self.connect_to_x_fd(),
+                GLib.IOCondition.IN | GLib.IOCondition.HUP | GLib.IOCondition.ERR,
+                self._on_x_event
+            )
             return
 
-        if poll_interval_seconds < 1:
+        if poll_interval_seconds is not None and poll_interval_seconds < 1:
             poll_interval_seconds = 1
 
-        print(f"IdleMonitor: Starting polling every {poll_interval_seconds} seconds.")
-        # Check immediately once, then start interval
-        GLib.idle_add(self._check_idle) # Check once on next idle
-        self._timer_source_id = GLib.timeout_add_seconds(poll_interval_seconds, self._check_idle)
+        log.info("Starting adaptive polling (cap: %s seconds).", poll_interval_seconds)
+        self._poll_interval_seconds = poll_interval_seconds
+        # Check right away; every check then schedules the next one
+        self._check_idle()
+
+
+    def set_threshold(self, idle_threshold_seconds: int):
+        """
+        Changes the idle threshold without recreating the monitor.
+
+        The X connection, alarms and signal connections are kept; the alarms
+        (or the next poll) are simply re-armed for the new threshold.
+
+        Args:
+            idle_threshold_seconds: The new idle threshold in seconds.
+        """
+        if idle_threshold_seconds < 1:
+            log.warning("Idle threshold must be at least 1 second. Setting to 1.")
+            idle_threshold_seconds = 1
+        threshold_ms = idle_threshold_seconds * 1000
+        if threshold_ms == self._idle_threshold_ms:
+            return
+        self._idle_threshold_ms = threshold_ms
+        log.info("Idle threshold changed to %ss.", idle_threshold_seconds)
+
+        if not self._initialized_successfully:
+            return
+
+        if self._sync_available:
+            self._set_alarm(self._idle_alarm, XSyncPositiveTransition, self._idle_threshold_ms)
+            self._set_alarm(self._reset_alarm, XSyncNegativeTransition, self._idle_threshold_ms - 1)
+            self._libX11.XFlush(self._display)
+            if self._x_source_id is not None:
+                # The new threshold may already be crossed; transitions won't tell us
+                current_value = XSyncValue()
+                if self._libXext.XSyncQueryCounter(self._display, self._idletime_counter, ctypes.byref(current_value)):
+                    self._set_idle_state(_sync_value_to_ms(current_value) >= self._idle_threshold_ms)
+        elif self._timer_source_id is not None:
+            # The pending check was scheduled for the old threshold
+            GLib.source_remove(self._timer_source_id)
+            self._check_idle()
+
+
+    def connect_to_x_fd(self) -> int:
+        """
+        Returns the file descriptor of the monitor's X connection.
+
+        This is the only source of wakeups for event-driven monitoring;
+        start() attaches it to the GLib main loop.
+        """
+        return self._libX11.XConnectionNumber(self._display)
 
 
     def stop(self):
-        """Stops the periodic polling."""
-        print("IdleMonitor: Stop requested.")
-        if self._timer_source_id:
+        """Stops monitoring and releases the X resources."""
+        log.debug("Stop requested.")
+        if self._timer_source_id is not None:
             GLib.source_remove(self._timer_source_id)
             self._timer_source_id = None
-            print("IdleMonitor: Polling stopped.")
+            log.debug("Polling stopped.")
+        if self._x_source_id is not None:
+            GLib.source_remove(self._x_source_id)
+            self._x_source_id = None
+            log.debug("X event watch removed.")
         # Cleanup X resources
         if self._initialized_successfully:
-             if self._saver_info:
-                  try:
-                    libX11.XFree(self._saver_info)
-                  except Exception as e:
-                       print(f"Warning: Error freeing XScreenSaverInfo: {e}", file=sys.stderr)
-                  self._saver_info = None
              if self._display:
-                  libX11.XCloseDisplay(self._display)
+                  for alarm in (self._idle_alarm, self._reset_alarm):
+                       if alarm:
+                            IdleMonitor._alarm_owners.pop(alarm, None)
+                            self._libXext.XSyncDestroyAlarm(self._display, alarm)
+                  self._idle_alarm = None
+                  self._reset_alarm = None
+                  # The connection may stay open for other instances
+                  self._libX11.XFlush(self._display)
+                  self._release_shared_x_resources(self._libX11)
                   self._display = None
+             self._saver_info = None
+             self._saver_info_contents = None
+             self._xss_query_args = None
              self._initialized_successfully = False # Mark as cleaned up
 
 
+    def _on_x_event(self, fd, condition) -> bool:
+        """
+        GLib callback for the X connection fd. Drains pending X events and
+        turns IDLETIME alarm notifications into user_idle/user_active signals.
+        """
+        if condition & (GLib.IOCondition.HUP | GLib.IOCondition.ERR):
+            log.error("X connection closed, stopping idle monitoring.")
+            self._x_source_id = None
+            return GLib.SOURCE_REMOVE
+
+        alarm_notify_type = self._sync_event_base + XSyncAlarmNotify
+        try:
+            while self._libX11.XPending(self._display):
+                self._libX11.XNextEvent(self._display, ctypes.byref(self._x_event))
+                if self._x_event.type != alarm_notify_type:
+                    continue
+
+                # Events on the shared connection may belong to another instance
+                alarm = self._x_event.xsyncalarm.alarm
+                owner = IdleMonitor._alarm_owners.get(alarm)
+                if owner is not None:
+                    owner._on_alarm(alarm)
+        except Exception as e:
+            log.error("Error while handling X events: %s", e)
+
+        if IdleMonitor._x_error_seen:
+            log.error("X error reported, stopping idle monitoring.")
+            self._x_source_id = None # This source is removed by returning False
+            self.stop()
+            return GLib.SOURCE_REMOVE
+
+        return GLib.SOURCE_CONTINUE
+
+
+    def _on_alarm(self, alarm):
+        """Re-arms the alarm that fired and applies the idle/active transition."""
+        if alarm == self._idle_alarm:
+            self._set_alarm(self._idle_alarm, XSyncPositiveTransition, self._idle_threshold_ms)
+            self._set_idle_state(True)
+        elif alarm == self._reset_alarm:
+            self._set_alarm(self._reset_alarm, XSyncNegativeTransition, self._idle_threshold_ms - 1)
+            self._set_idle_state(False)
+
+
+    def _set_idle_state(self, currently_considered_idle: bool):
+        """Applies an idle/active observation and emits a signal on transitions."""
+        if currently_considered_idle and not self._is_idle:
+            self._is_idle = True
+            log.info("User became idle.")
+            self.emit('user_idle')
+        elif not currently_considered_idle and self._is_idle:
+            self._is_idle = False
+            log.info("User became active.")
+            self.emit('user_active')
+
+
+    def _query_idle_ms(self):
+        """
+        Queries XScreenSaver for the current idle time.
+
+        Requires the MIT-SCREEN-SAVER extension (checked in __init__). X
+        errors are reported through the X error handler, not the return
+        value; check IdleMonitor._x_error_seen after calling this.
+
+        Returns:
+            int: Idle time in milliseconds.
+        """
+        self._xss_query(*self._xss_query_args)
+        return self._saver_info_contents.idle
+
+
     def _check_idle(self) -> bool:
         """
-        Internal method called periodically to check the idle time.
-        Returns True to keep the timer going (if called by timeout_add),
-        or False if called by idle_add (only run once).
+        Internal method called by the polling fallback (no X Sync) to check
+        the idle time. Each check schedules the next one based on how far
+        the user is from the idle threshold, so this always returns False
+        (which is also harmless when start() calls it directly).
         """
+        self._timer_source_id = None
         if not self._initialized_successfully or not self._display or not self._saver_info:
-             print("IdleMonitor: Check called but not initialized.", file=sys.stderr)
+             log.error("Check called but not initialized.")
              return False # Stop timer if it somehow got started
 
+        next_check_seconds = self.DEFAULT_POLL_INTERVAL_SECONDS
         try:
-            # Query XScreenSaver
-            status = libXss.XScreenSaverQueryInfo(self._display, self._root_window, self._saver_info)
+            current_idle_ms = self._query_idle_ms()
 
-            if status == 0:
-                 # This seems to indicate an error according to some examples
-                 print("Warning: XScreenSaverQueryInfo returned status 0 (potential error).", file=sys.stderr)
-                 # We might want to stop polling or handle this more gracefully
-                 # For now, just report and continue trying
-                 return True # Keep timer running
+            # The query waits for its reply, so any error has been handled
+            if IdleMonitor._x_error_seen:
+                log.error("X error reported, stopping idle monitoring.")
+                self.stop()
+                return False
 
-            current_idle_ms = self._saver_info.contents.idle
             # print(f"Idle time: {current_idle_ms} ms") # Debug print
 
-            currently_considered_idle = current_idle_ms >= self._idle_threshold_ms
+            self._set_idle_state(current_idle_ms >= self._idle_threshold_ms)
 
-            # --- State Transition Logic ---
-            if currently_considered_idle and not self._is_idle:
-                self._is_idle = True
-                print("IdleMonitor: User became idle.")
-                self.emit('user_idle')
-            elif not currently_considered_idle and self._is_idle:
-                self._is_idle = False
-                print("IdleMonitor: User became active.")
-                self.emit('user_active')
+            if self._is_idle:
+                # Poll quickly so we notice the user coming back
+                next_check_seconds = self.IDLE_POLL_INTERVAL_SECONDS
+            else:
+                # The user can't become idle before the threshold is reached
+                next_check_seconds = max(1, (self._idle_threshold_ms - current_idle_ms) // 1000)
 
         except Exception as e:
             # Catch potential errors during X calls within the callback
-            print(f"Error during idle check: {e}", file=sys.stderr)
-            # Decide if we should stop the timer on error
-            # return False # Option: Stop polling on error
-            pass # Option: Log error and keep trying
+            log.error("Error during idle check: %s", e)
+            # Log error and keep trying at the regular interval
 
-        # Keep the timer running if we were called by timeout_add
-        return True if self._timer_source_id else False
+        if self._poll_interval_seconds:
+            next_check_seconds = min(next_check_seconds, self._poll_interval_seconds)
+
+        # stop() may have been called from one of our signal handlers
+        if self._initialized_successfully:
+            # Default-idle priority lets GLib batch this with other wakeups
+            self._timer_source_id = GLib.timeout_add_seconds(
+                next_check_seconds, self._check_idle, priority=GLib.PRIORITY_DEFAULT_IDLE)
+        return False # This source is done; the next check has its own
 
 
 # --- Test Code ---
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG, format="%(name)s: %(message)s")
     print("Running IdleMonitor Test...")
     print("This requires an X11 session (or XWayland).")
     print("Test will run for 60 seconds.")
@@ -284,7 +791,7 @@ if __name__ == '__main__':
             monitor.connect('user_idle', on_user_idle)
             monitor.connect('user_active', on_user_active)
 
-            # Start polling (e.g., every 2 seconds for faster testing feedback)
+            # Start monitoring (polls every 2 seconds if XSync is unavailable)
             monitor.start(poll_interval_seconds=2)
 
             # Schedule test shutdown
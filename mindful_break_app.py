@@ -2,6 +2,7 @@
 
 import sys
 import os
+import logging
 import gi
 
 try:
@@ -22,16 +23,14 @@ except ValueError as e:
 
 from gi.repository import Gtk, GLib, GObject, Gio
 
-# Import all the components
+log = logging.getLogger(__name__)
+
+# Import the components needed to get the tray up; IdleMonitor, the windows
+# and the dialog are imported where they are first used
 try:
     from settings_manager import SettingsManager
     from timer_manager import TimerManager
-    from idle_monitor import IdleMonitor
     from tray_icon import TrayIcon
-    from settings_window import SettingsWindow # GTK3 version
-    from break_overlay import BreakOverlayWindow # GTK3 version
-    from sound_player import SoundPlayer # playsound version with block=True fix
-    from pause_duration_dialog import PauseDurationDialog # Import dialog
 except ImportError as e:
      print(f"Error: Failed to import one or more application components. {e}", file=sys.stderr)
      print("Ensure all .py files are present.")
@@ -40,13 +39,37 @@ except ImportError as e:
 # --- Constants ---
 APP_ID = "org.example.mindfulbreak"
 DEFAULT_SOUND_FILE = "notification.wav" # ** Update if needed **
-IDLE_POLL_INTERVAL_SECONDS = 30
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+_DEFAULT_SOUND_PATH = (DEFAULT_SOUND_FILE if os.path.isabs(DEFAULT_SOUND_FILE)
+                       else os.path.join(_SCRIPT_DIR, DEFAULT_SOUND_FILE))
 
 class MindfulBreakApp(Gtk.Application):
     """
     Main application class integrating all components for the break reminder.
     """
 
+    # (component attribute, signal name, handler method name)
+    _SIGNAL_BINDINGS = (
+        # --- Timer Manager Signals ---
+        ('timer_manager', 'break_started', 'on_break_started'),
+        ('timer_manager', 'timer_paused', 'on_timer_paused'),
+        ('timer_manager', 'timer_resumed', 'on_timer_resumed'),
+        ('timer_manager', 'timer_stopped', 'on_timer_stopped'),
+        ('timer_manager', 'timer_started', 'on_timer_started'),
+        # --- Tray Icon Signals ---
+        ('tray_icon', 'start_timer_requested', 'on_start_timer_requested'),
+        ('tray_icon', 'resume_timer_requested', 'on_resume_timer_requested'),
+        ('tray_icon', 'pause_for_requested', 'on_pause_for_requested'),
+        ('tray_icon', 'set_time_requested', 'on_set_time_requested'),
+        ('tray_icon', 'settings_requested', 'on_settings_requested'),
+        ('tray_icon', 'quit_requested', 'on_quit_requested'),
+    )
+    # The idle monitor is recreated when it is re-enabled, so it is wired separately
+    _IDLE_MONITOR_BINDINGS = (
+        ('idle_monitor', 'user_idle', 'on_user_idle'),
+        ('idle_monitor', 'user_active', 'on_user_active'),
+    )
+
     def __init__(self, **kwargs):
         super().__init__(application_id=APP_ID,
                          flags=Gio.ApplicationFlags.HANDLES_COMMAND_LINE,
@@ -60,19 +83,26 @@ class MindfulBreakApp(Gtk.Application):
         self.sound_player = None
         self.settings_window = None
         self.break_overlay_window = None
+        self._tray_update = None # Cached tray_icon.update_status for the tick paths
+        self._pending_tray_state = None # Countdown state waiting for a low priority repaint
+        self._tray_refresh_id = None
+        self._idle_monitor_update_id = None # Coalesces settings-driven monitor updates
+        self._duration_dialog = None # Shared by "Pause for..." and "Set Time..."
+        self._duration_dialog_response_id = None
 
         # State flags and variables
         self._idle_monitor_enabled = True
         self._idle_threshold_seconds = 120
         self._paused_due_to_idle = False
-        self._manual_pause_timer_id = None
-        self._manual_pause_remaining_seconds = 0
+        self._manual_pause_timer_id = None # Fires once, at the deadline
+        self._manual_pause_label_id = None # Low priority tray label refresh
+        self._manual_pause_deadline = 0 # GLib monotonic time (microseconds)
 
         self.connect("command-line", self.on_command_line)
 
 
     def on_command_line(self, command_line, *args):
-        print("MindfulBreakApp: Command line signal received.")
+        log.debug("Command line signal received.")
         self.activate()
         return 0
 
@@ -80,17 +110,13 @@ class MindfulBreakApp(Gtk.Application):
     def do_startup(self):
         """Initialize components when the application first starts."""
         Gtk.Application.do_startup(self)
-        print("MindfulBreakApp: Starting up...")
+        log.info("Starting up...")
 
         try:
             self.settings_manager = SettingsManager()
+            self.settings_manager.on_changed(self.on_settings_file_changed)
 
-            # --- Sound Player Setup ---
-            sound_path = DEFAULT_SOUND_FILE
-            if not os.path.isabs(sound_path):
-                script_dir = os.path.dirname(os.path.abspath(__file__))
-                sound_path = os.path.join(script_dir, DEFAULT_SOUND_FILE)
-            self.sound_player = SoundPlayer(sound_file_path=sound_path)
+            # The sound player is created on the first break (see on_break_started)
 
             # --- Timer Manager Setup ---
             self.timer_manager = TimerManager()
@@ -103,50 +129,52 @@ class MindfulBreakApp(Gtk.Application):
             self._idle_threshold_seconds = self.settings_manager.get_idle_threshold_seconds()
 
             if self._idle_monitor_enabled:
-                 print(f"Idle Monitor enabled, threshold: {self._idle_threshold_seconds}s. Initializing...")
+                 log.info("Idle Monitor enabled, threshold: %ss. Initializing...", self._idle_threshold_seconds)
+                 from idle_monitor import IdleMonitor
                  self.idle_monitor = IdleMonitor(idle_threshold_seconds=self._idle_threshold_seconds)
                  if self.idle_monitor._initialized_successfully:
-                      self.idle_monitor.start(poll_interval_seconds=IDLE_POLL_INTERVAL_SECONDS)
+                      self.idle_monitor.start()
                  else:
-                      print("Warning: Idle monitor failed to initialize despite being enabled. Idle detection disabled.")
+                      log.warning("Idle monitor failed to initialize despite being enabled. Idle detection disabled.")
                       self.idle_monitor = None
             else:
-                 print("Idle Monitor disabled in settings.")
+                 log.info("Idle Monitor disabled in settings.")
 
             # --- Tray Icon Setup ---
             self.tray_icon = TrayIcon(indicator_id=APP_ID + ".indicator")
+            self._tray_update = self.tray_icon.update_status
 
             # --- Connect signals ---
             self._connect_signals()
 
-            print("MindfulBreakApp: Startup complete.")
+            log.info("Startup complete.")
 
         except Exception as e:
-            print(f"FATAL ERROR during startup: {e}", file=sys.stderr)
+            log.critical("Fatal error during startup: %s", e)
             self.quit()
 
 
     def do_activate(self):
         """Called when the application is activated."""
         self.hold()
-        print("MindfulBreakApp: Holding application active.")
+        log.info("Holding application active.")
 
         if self.tray_icon:
             self.tray_icon.update_status(self.tray_icon.STATE_STOPPED)
-        print("MindfulBreakApp: Activated (running in background).")
+        log.info("Activated (running in background).")
 
         # --- Auto-start Timer ---
-        print("MindfulBreakApp: Attempting auto-start...")
+        log.debug("Attempting auto-start...")
         if self.settings_manager and self.timer_manager:
             try:
                 self.on_start_timer_requested(None)
-                print("MindfulBreakApp: Auto-start initiated.")
+                log.info("Auto-start initiated.")
             except Exception as e:
-                 print(f"Error during auto-start: {e}", file=sys.stderr)
+                 log.error("Error during auto-start: %s", e)
                  if self.tray_icon:
                       self.tray_icon.update_status(self.tray_icon.STATE_STOPPED)
         else:
-             print("MindfulBreakApp: Cannot auto-start, components missing.")
+             log.debug("Cannot auto-start, components missing.")
              if self.tray_icon:
                   self.tray_icon.update_status(self.tray_icon.STATE_STOPPED)
 
@@ -154,98 +182,102 @@ class MindfulBreakApp(Gtk.Application):
     def do_shutdown(self):
         """Clean up resources when the application quits."""
         if hasattr(self, 'get_is_busy') and self.get_is_busy():
-             print("MindfulBreakApp: Releasing hold during shutdown.")
+             log.debug("Releasing hold during shutdown.")
              self.release()
 
-        print("MindfulBreakApp: Shutting down...")
+        log.info("Shutting down...")
         self._cancel_manual_pause()
+        if self._tray_refresh_id is not None:
+            GLib.source_remove(self._tray_refresh_id)
+            self._tray_refresh_id = None
+        if self._idle_monitor_update_id is not None:
+            GLib.source_remove(self._idle_monitor_update_id)
+            self._idle_monitor_update_id = None
 
         if self.timer_manager:
             self.timer_manager.stop()
         if self.idle_monitor:
             self.idle_monitor.stop()
+        if self.sound_player:
+            self.sound_player.shutdown()
 
-        if self.settings_window and hasattr(self.settings_window, 'is_destroyed') and not self.settings_window.is_destroyed():
-             print("MindfulBreakApp: Destroying settings window on shutdown.")
+        if self.settings_window is not None:
+             log.debug("Destroying settings window on shutdown.")
              self.settings_window.destroy()
-        if self.break_overlay_window and hasattr(self.break_overlay_window, 'is_destroyed') and not self.break_overlay_window.is_destroyed():
-             print("MindfulBreakApp: Destroying overlay window on shutdown.")
+        if self.break_overlay_window is not None:
+             log.debug("Destroying overlay window on shutdown.")
              self.break_overlay_window.destroy()
+        if self._duration_dialog is not None:
+             self._duration_dialog.destroy()
 
         Gtk.Application.do_shutdown(self)
-        print("MindfulBreakApp: Shutdown complete.")
+        log.info("Shutdown complete.")
 
 
     def _connect_signals(self):
         """Connect signals from components to application handlers."""
         if not self.timer_manager or not self.tray_icon:
-            print("Error: Cannot connect signals, components not initialized.", file=sys.stderr)
+            log.error("Cannot connect signals, components not initialized.")
             return
 
-        # --- Timer Manager Signals ---
-        self.timer_manager.connect('timer_tick', self.on_timer_tick)
-        self.timer_manager.connect('break_started', self.on_break_started)
-        self.timer_manager.connect('timer_paused', self.on_timer_paused)
-        self.timer_manager.connect('timer_resumed', self.on_timer_resumed)
-        self.timer_manager.connect('timer_stopped', self.on_timer_stopped)
-        self.timer_manager.connect('timer_started', self.on_timer_started)
-
-        # --- Idle Monitor Signals ---
+        self._connect_bindings(self._SIGNAL_BINDINGS)
+        # Ticks are the most frequent event, so they skip GObject signal dispatch
+        self.timer_manager.add_tick_listener(self.on_timer_tick)
         if self.idle_monitor and self.idle_monitor._initialized_successfully:
-            self.idle_monitor.connect('user_idle', self.on_user_idle)
-            self.idle_monitor.connect('user_active', self.on_user_active)
+            self._connect_bindings(self._IDLE_MONITOR_BINDINGS)
 
-        # --- Tray Icon Signals ---
-        self.tray_icon.connect('start_timer_requested', self.on_start_timer_requested)
-        # self.tray_icon.connect('pause_timer_requested', self.on_pause_timer_requested) # REMOVED connection
-        self.tray_icon.connect('resume_timer_requested', self.on_resume_timer_requested)
-        self.tray_icon.connect('pause_for_requested', self.on_pause_for_requested)
-        self.tray_icon.connect('set_time_requested', self.on_set_time_requested)        
-        self.tray_icon.connect('settings_requested', self.on_settings_requested)
-        self.tray_icon.connect('quit_requested', self.on_quit_requested)
+    def _connect_bindings(self, bindings):
+        """Connects each (component, signal, handler) entry of a binding table."""
+        for component_name, signal_name, handler_name in bindings:
+            getattr(self, component_name).connect(signal_name, getattr(self, handler_name))
 
 
     # --- Signal Handler Methods ---
 
     # --- Timer Handlers ---
-    def on_timer_tick(self, timer_manager, remaining_seconds):
-        if self.tray_icon and timer_manager.state == timer_manager.STATE_RUNNING:
-            self.tray_icon.update_status(self.tray_icon.STATE_RUNNING, remaining_seconds)
+    def on_timer_tick(self, remaining_seconds):
+        if self._tray_update and self.timer_manager.state == self.timer_manager.STATE_RUNNING:
+            self._queue_tray_refresh(TrayIcon.STATE_RUNNING)
 
     def on_break_started(self, timer_manager):
-        print("App: Break started.")
-        if self.sound_player:
-            self.sound_player.play_break_sound()
+        log.info("Break started.")
+        if self.sound_player is None:
+            from sound_player import SoundPlayer # playsound version with block=True fix
+            self.sound_player = SoundPlayer(sound_file_path=_DEFAULT_SOUND_PATH)
+        self.sound_player.play_break_sound()
         if self.tray_icon:
             self.tray_icon.update_status(self.tray_icon.STATE_BREAK)
 
-        if self.break_overlay_window and hasattr(self.break_overlay_window, 'is_destroyed') and not self.break_overlay_window.is_destroyed():
-             print("App: Destroying previous overlay instance.")
+        if self.break_overlay_window is not None:
+             log.debug("Destroying previous overlay instance.")
              self.break_overlay_window.destroy()
 
         # --- Get Overlay Geometry from Settings ---
-        overlay_width = self.settings_manager.get_overlay_width()
-        overlay_height = self.settings_manager.get_overlay_height()
-        overlay_top_margin = self.settings_manager.get_overlay_top_margin()
-        overlay_centered = self.settings_manager.get_overlay_horizontal_centered()
-        print(f"App: Creating BreakOverlayWindow ({overlay_width}x{overlay_height}, top: {overlay_top_margin}, centered: {overlay_centered})")
+        settings = self.settings_manager.snapshot
+        overlay_width = settings.overlay_width
+        overlay_height = settings.overlay_height
+        overlay_top_margin = settings.overlay_top_margin
+        overlay_centered = settings.overlay_horizontal_centered
+        from break_overlay import BreakOverlayWindow # GTK3 version
+        log.debug("Creating BreakOverlayWindow (%sx%s, top: %s, centered: %s)", overlay_width, overlay_height, overlay_top_margin, overlay_centered)
 
         self.break_overlay_window = BreakOverlayWindow(
             width=overlay_width,
             height=overlay_height,
             top_margin=overlay_top_margin,
-            is_centered=overlay_centered
+            is_centered=overlay_centered,
+            idle_monitor=self.idle_monitor
         )
 
-        print("App: Connecting overlay signals...")
+        log.debug("Connecting overlay signals...")
         self.break_overlay_window.connect('dismissed', self.on_overlay_dismissed)        
         self.break_overlay_window.connect('postponed', self.on_overlay_postponed)
         self.break_overlay_window.connect('destroy', self.on_overlay_window_destroyed)
-        print("App: Showing overlay...")
+        log.debug("Showing overlay...")
         self.break_overlay_window.show_and_start_elapsed_timer()
 
     def on_timer_paused(self, timer_manager):
-        if self._manual_pause_timer_id:
+        if self._manual_pause_timer_id is not None:
              return
         if self.tray_icon:
             if self._paused_due_to_idle:
@@ -256,8 +288,8 @@ class MindfulBreakApp(Gtk.Application):
     def on_timer_resumed(self, timer_manager):
         self._cancel_manual_pause()
         self._paused_due_to_idle = False
-        if self.tray_icon:
-             self.tray_icon.update_status(self.tray_icon.STATE_RUNNING, timer_manager.remaining_seconds)
+        if self._tray_update:
+             self._tray_update(TrayIcon.STATE_RUNNING, timer_manager.remaining_seconds)
 
     def on_timer_stopped(self, timer_manager):
         self._cancel_manual_pause()
@@ -267,39 +299,39 @@ class MindfulBreakApp(Gtk.Application):
 
     def on_timer_started(self, timer_manager):
          self._cancel_manual_pause() # Cancel manual pause on any start/restart/postpone
-         print(f"App: Timer started/postponed. Initial seconds: {timer_manager.remaining_seconds}")
+         log.debug("Timer started/postponed. Initial seconds: %s", timer_manager.remaining_seconds)
          self._paused_due_to_idle = False
-         if self.tray_icon:
+         if self._tray_update:
              # This call is correct - it passes the initial seconds
              # The updated update_status method will now format it as MM:SS
-             self.tray_icon.update_status(self.tray_icon.STATE_RUNNING, timer_manager.remaining_seconds)
+             self._tray_update(TrayIcon.STATE_RUNNING, timer_manager.remaining_seconds)
 
     # --- Idle Handlers ---
     def on_user_idle(self, idle_monitor):
-        print("App: User is idle.")
-        if self._manual_pause_timer_id:
-            print("App: Manual pause active, ignoring idle.")
+        log.debug("User is idle.")
+        if self._manual_pause_timer_id is not None:
+            log.debug("Manual pause active, ignoring idle.")
             return
         if self.timer_manager and self.timer_manager.state == self.timer_manager.STATE_RUNNING:
-             print("App: Pausing timer due to idle.")
+             log.debug("Pausing timer due to idle.")
              self._paused_due_to_idle = True
              self.timer_manager.pause()
 
     def on_user_active(self, idle_monitor):
-        print("App: User is active.")
-        if self._manual_pause_timer_id:
-             print("App: Manual pause active, ignoring user active for main timer.")
+        log.debug("User is active.")
+        if self._manual_pause_timer_id is not None:
+             log.debug("Manual pause active, ignoring user active for main timer.")
              self._paused_due_to_idle = False
              return
         if self.timer_manager and self.timer_manager.state == self.timer_manager.STATE_PAUSED and self._paused_due_to_idle:
-             print("App: Resuming timer after idle period.")
+             log.debug("Resuming timer after idle period.")
              self.timer_manager.resume()
         elif self._paused_due_to_idle:
              self._paused_due_to_idle = False
 
     # --- Tray Menu Handlers ---
     def on_start_timer_requested(self, tray_icon):
-        print("App: Start timer requested via tray.")
+        log.debug("Start timer requested via tray.")
         if not self.settings_manager or not self.timer_manager: return
         interval = self.settings_manager.get_break_interval()
         self.timer_manager.set_interval(interval)
@@ -308,7 +340,7 @@ class MindfulBreakApp(Gtk.Application):
     # on_pause_timer_requested method removed
 
     def on_resume_timer_requested(self, tray_icon):
-        print("App: Resume timer requested via tray.")
+        log.debug("Resume timer requested via tray.")
         if not self.timer_manager: return
         self._cancel_manual_pause()
         self._paused_due_to_idle = False
@@ -316,87 +348,110 @@ class MindfulBreakApp(Gtk.Application):
             self.timer_manager.resume()
 
     def on_pause_for_requested(self, tray_icon):
-        print("App: Pause for duration requested.")
+        log.debug("Pause for duration requested.")
         if self.timer_manager is None: return
-        if self._manual_pause_timer_id:
-             print("App: Manual pause already active.")
+        if self._manual_pause_timer_id is not None:
+             log.debug("Manual pause already active.")
              return
         # Sensitivity check in tray icon is primary guard
         # if self.timer_manager.state != self.timer_manager.STATE_RUNNING:
         #     print("App: Cannot 'Pause for...' when timer is not running.")
         #     return
 
-        dialog = PauseDurationDialog(parent_window=None)
-        dialog.connect("response", self.on_pause_dialog_response)
+        self._present_duration_dialog("Pause Timer", self.on_pause_dialog_response)
 
     def on_set_time_requested(self, tray_icon):
-        print("App: Set Time requested.")
+        log.debug("Set Time requested.")
         if self.timer_manager is None: return
 
         # Re-use the dialog with a different title
-        dialog = PauseDurationDialog(parent_window=None, title="Set Remaining Time")
-        dialog.connect("response", self.on_set_time_dialog_response)
+        self._present_duration_dialog("Set Remaining Time", self.on_set_time_dialog_response)
+
+    def _present_duration_dialog(self, title, response_handler):
+        """Shows the shared duration dialog, routing its response to response_handler."""
+        if self._duration_dialog is None:
+            from pause_duration_dialog import PauseDurationDialog
+            self._duration_dialog = PauseDurationDialog(parent_window=None, title=title)
+            # Closing the window hides it so it can be shown again
+            self._duration_dialog.connect('delete-event', lambda dialog, event: dialog.hide_on_delete())
+            self._duration_dialog.connect('destroy', self.on_duration_dialog_destroyed)
+        else:
+            self._duration_dialog.disconnect(self._duration_dialog_response_id)
+            self._duration_dialog.set_title(title)
+            self._duration_dialog.spin_duration.set_value(5)
+            self._duration_dialog.spin_duration.grab_focus()
+        self._duration_dialog_response_id = self._duration_dialog.connect("response", response_handler)
+        self._duration_dialog.present()
+
+    def on_duration_dialog_destroyed(self, widget):
+        if self._duration_dialog == widget:
+            self._duration_dialog = None
+            self._duration_dialog_response_id = None
 
     # --- Dialog Handlers ---
     def on_set_time_dialog_response(self, dialog, response_id):
         duration_seconds = 0
         if response_id == Gtk.ResponseType.OK:
             duration_seconds = dialog.get_duration_seconds()
-            print(f"App: Set time dialog OK, new duration: {duration_seconds}s")
+            log.debug("Set time dialog OK, new duration: %ss", duration_seconds)
             if duration_seconds <= 0:
-                 print("App: Invalid duration, ignoring.")
-                 dialog.destroy()
+                 log.debug("Invalid duration, ignoring.")
+                 dialog.hide()
                  return
         else:
-            print("App: Set time dialog cancelled.")
-            dialog.destroy()
+            log.debug("Set time dialog cancelled.")
+            dialog.hide()
             return
 
-        dialog.destroy() # Destroy dialog before changing the timer
+        dialog.hide() # Hide dialog before changing the timer
 
-        # Convert seconds to float minutes for the postpone method
-        duration_minutes = duration_seconds / 60.0
-        self.timer_manager.postpone(duration_minutes)        
+        self.timer_manager.postpone_seconds(duration_seconds)
 
     def on_settings_requested(self, tray_icon):
-        print("App: Settings requested.")
+        log.debug("Settings requested.")
         if not self.settings_manager: return
 
-        if self.settings_window and hasattr(self.settings_window, 'is_destroyed') and not self.settings_window.is_destroyed():
-             print("App: Settings window already open, presenting.")
-             self.settings_window.present()
+        if self.settings_window is not None:
+             log.debug("Reusing settings window, presenting.")
+             self.settings_window.show_with_current_values()
              return
 
-        print("App: Creating settings window.")
+        log.debug("Creating settings window.")
+        from settings_window import SettingsWindow # GTK3 version
         self.settings_window = SettingsWindow(settings_manager=self.settings_manager)
         self.settings_window.connect('settings_saved', self.on_settings_saved)
         self.settings_window.connect('destroy', self.on_settings_window_destroyed)
 
     def on_quit_requested(self, tray_icon):
         """Handles the quit request from the tray icon."""
-        print("App: Quit requested via tray.")
+        log.info("Quit requested via tray.")
         if hasattr(self, 'get_is_busy') and self.get_is_busy():
             self.release()
         self.quit()
 
     # --- Settings Window Handlers ---
     def on_settings_saved(self, settings_window, new_interval):
-        print(f"App: Settings saved signal received. Main interval (for next cycle): {new_interval} minutes.")
+        log.debug("Settings saved signal received. Main interval (for next cycle): %s minutes.", new_interval)
         if self.timer_manager:
             self.timer_manager.set_interval(new_interval)
             if self.timer_manager.state == self.timer_manager.STATE_STOPPED:
                  if self.tray_icon:
                       self.tray_icon.update_status(self.tray_icon.STATE_STOPPED)
-        self._update_idle_monitor_state() # Update idle monitor based on new settings
+        self._schedule_idle_monitor_update() # Update idle monitor based on new settings
+
+    def on_settings_file_changed(self, settings_manager):
+        """Applies settings that were changed on disk by another process."""
+        log.debug("Settings file changed, applying new settings.")
+        self.on_settings_saved(None, settings_manager.get_break_interval())
 
     def on_settings_window_destroyed(self, widget):
-         print("App: Settings window destroyed.")
+         log.debug("Settings window destroyed.")
          if self.settings_window == widget:
               self.settings_window = None
 
     # --- Overlay Window Handlers ---
     def on_overlay_dismissed(self, overlay_window):
-        print("App: Handling overlay dismissal (Done) signal...")
+        log.debug("Handling overlay dismissal (Done) signal...")
         if not self.settings_manager or not self.timer_manager: return
         # This effectively ends the break and starts the next work cycle
         interval = self.settings_manager.get_break_interval()
@@ -404,13 +459,13 @@ class MindfulBreakApp(Gtk.Application):
         self.timer_manager.start()
 
     def on_overlay_postponed(self, overlay_window, minutes):
-        print(f"App: Handling overlay postpone signal ({minutes} minutes)...")
+        log.debug("Handling overlay postpone signal (%s minutes)...", minutes)
         if not self.timer_manager: return
         # Convert minutes if necessary (postpone method expects float minutes)
         self.timer_manager.postpone(float(minutes))
 
     def on_overlay_window_destroyed(self, widget):
-        print("App: Break overlay window destroyed.")
+        log.debug("Break overlay window destroyed.")
         if self.break_overlay_window == widget:
             self.break_overlay_window = None
 
@@ -418,84 +473,146 @@ class MindfulBreakApp(Gtk.Application):
         duration_seconds = 0 # Get SECONDS from dialog method
         if response_id == Gtk.ResponseType.OK:
             duration_seconds = dialog.get_duration_seconds()
-            print(f"App: Pause dialog OK, duration: {duration_seconds}s")
+            log.debug("Pause dialog OK, duration: %ss", duration_seconds)
             if duration_seconds <= 0:
-                 print("App: Invalid duration, ignoring.")
-                 dialog.destroy()
+                 log.debug("Invalid duration, ignoring.")
+                 dialog.hide()
                  return
         else:
-            print("App: Pause dialog cancelled.")
-            dialog.destroy()
+            log.debug("Pause dialog cancelled.")
+            dialog.hide()
             return
 
-        dialog.destroy() # Destroy dialog before starting pause logic
+        dialog.hide() # Hide dialog before starting pause logic
 
-        self._paused_due_to_idle = False
-        if self.timer_manager.state == self.timer_manager.STATE_RUNNING:
-             self.timer_manager.pause()
+        # Pausing updates the tray too; only show the final manual pause state
+        with self.tray_icon.batch():
+            self._paused_due_to_idle = False
+            if self.timer_manager.state == self.timer_manager.STATE_RUNNING:
+                 self.timer_manager.pause()
 
-        self._manual_pause_remaining_seconds = duration_seconds
-        self._manual_pause_timer_id = GLib.timeout_add_seconds(1, self._manual_pause_tick)
+            self._manual_pause_deadline = GLib.get_monotonic_time() + duration_seconds * 1_000_000
+            self._manual_pause_timer_id = GLib.timeout_add_seconds(
+                duration_seconds, self._manual_pause_finished, priority=GLib.PRIORITY_DEFAULT_IDLE)
+            # The countdown label is cosmetic; the resume doesn't depend on it
+            self._manual_pause_label_id = GLib.timeout_add_seconds(
+                1, self._manual_pause_tick, priority=GLib.PRIORITY_LOW)
 
-        if self.tray_icon:
-             self.tray_icon.update_status(self.tray_icon.STATE_MANUAL_PAUSE, self._manual_pause_remaining_seconds)
+            self.tray_icon.update_status(self.tray_icon.STATE_MANUAL_PAUSE, duration_seconds)
 
     # --- Manual Pause Timer Logic ---
     def _cancel_manual_pause(self):
         """Stops the manual pause timer if it's active."""
-        if self._manual_pause_timer_id:
-            print("App: Cancelling manual pause timer.")
+        if self._manual_pause_label_id is not None:
+            GLib.source_remove(self._manual_pause_label_id)
+            self._manual_pause_label_id = None
+        if self._manual_pause_timer_id is not None:
+            log.debug("Cancelling manual pause timer.")
             GLib.source_remove(self._manual_pause_timer_id)
             self._manual_pause_timer_id = None
-            self._manual_pause_remaining_seconds = 0
+            self._manual_pause_deadline = 0
             if self.timer_manager and self.timer_manager.state == self.timer_manager.STATE_PAUSED:
                  if self.tray_icon:
                       self.on_timer_paused(self.timer_manager) # Restore visual state
 
-    def _manual_pause_tick(self):
-        """Callback for the temporary manual pause timer."""
-        if self._manual_pause_remaining_seconds <= 0:
-            print("Warning: Manual pause tick called with zero/negative time remaining.")
-            self._cancel_manual_pause() # Ensure timer ID is cleared
-            if self.timer_manager and self.timer_manager.state == self.timer_manager.STATE_PAUSED:
-                 print("App: Resuming main timer after manual pause finished (from tick).")
-                 self.timer_manager.resume()
-            return False # Stop this timer
-
-        self._manual_pause_remaining_seconds -= 1
+    def _manual_pause_remaining_seconds(self) -> int:
+        """Whole seconds left until the manual pause deadline (rounded up)."""
+        remaining_us = self._manual_pause_deadline - GLib.get_monotonic_time()
+        return max(0, -(-remaining_us // 1_000_000))
 
-        if self.tray_icon:
-             self.tray_icon.update_status(self.tray_icon.STATE_MANUAL_PAUSE, self._manual_pause_remaining_seconds)
-
-        if self._manual_pause_remaining_seconds <= 0:
-            print("App: Manual pause duration finished.")
-            self._manual_pause_timer_id = None # Mark timer as stopped before resuming
-            if self.timer_manager and self.timer_manager.state == self.timer_manager.STATE_PAUSED:
-                 print("App: Resuming main timer after manual pause finished.")
-                 self.timer_manager.resume()
-            return False # Stop this timer
-        else:
-            return True # Continue this timer
+    def _manual_pause_tick(self):
+        """Refreshes the tray countdown while a manual pause is active."""
+        if self._tray_update:
+             self._queue_tray_refresh(TrayIcon.STATE_MANUAL_PAUSE)
+        return True # Removed by _manual_pause_finished/_cancel_manual_pause
+
+    def _manual_pause_finished(self):
+        """Callback for the manual pause deadline."""
+        # timeout_add_seconds only has whole-second accuracy (and may be
+        # batched with other timers), so check the deadline itself
+        remaining_seconds = self._manual_pause_remaining_seconds()
+        if remaining_seconds > 0:
+            self._manual_pause_timer_id = GLib.timeout_add_seconds(
+                remaining_seconds, self._manual_pause_finished, priority=GLib.PRIORITY_DEFAULT_IDLE)
+            return False # Replaced by the rescheduled timer
+
+        log.debug("Manual pause duration finished.")
+        self._manual_pause_timer_id = None # Mark timer as stopped before resuming
+        if self._manual_pause_label_id is not None:
+            GLib.source_remove(self._manual_pause_label_id)
+            self._manual_pause_label_id = None
+        if self.timer_manager and self.timer_manager.state == self.timer_manager.STATE_PAUSED:
+             log.debug("Resuming main timer after manual pause finished.")
+             self.timer_manager.resume()
+        return False # Stop this timer
+
+    # --- Low priority countdown repaints ---
+    def _queue_tray_refresh(self, state):
+        """
+        Schedules a countdown repaint of the tray at low priority.
+
+        Ticks only refresh the cosmetic MM:SS label, so they may wait behind
+        other events; several queued ticks collapse into one repaint that
+        shows the latest value. State transitions keep updating the tray
+        directly.
+        """
+        self._pending_tray_state = state
+        if self._tray_refresh_id is None:
+            self._tray_refresh_id = GLib.idle_add(self._apply_tray_refresh, priority=GLib.PRIORITY_LOW)
+
+    def _apply_tray_refresh(self):
+        """Idle callback for _queue_tray_refresh."""
+        self._tray_refresh_id = None
+        state = self._pending_tray_state
+        self._pending_tray_state = None
+        # A transition may have happened since the tick; only repaint the
+        # countdown if it is still what the tray should be showing
+        if state == TrayIcon.STATE_RUNNING:
+            if self.timer_manager and self.timer_manager.state == self.timer_manager.STATE_RUNNING:
+                self._tray_update(state, self.timer_manager.remaining_seconds)
+        elif state == TrayIcon.STATE_MANUAL_PAUSE:
+            if self._manual_pause_timer_id is not None:
+                self._tray_update(state, self._manual_pause_remaining_seconds())
+        return False # Run once
 
     # --- Helper to update idle monitor state ---
+    def _schedule_idle_monitor_update(self):
+        """
+        Queues _update_idle_monitor_state for the next idle moment.
+
+        Several saves in quick succession result in a single update that
+        reads the final settings.
+        """
+        if self._idle_monitor_update_id is None:
+            self._idle_monitor_update_id = GLib.idle_add(
+                self._apply_idle_monitor_update, priority=GLib.PRIORITY_DEFAULT_IDLE)
+
+    def _apply_idle_monitor_update(self):
+        """Idle callback for _schedule_idle_monitor_update."""
+        self._idle_monitor_update_id = None
+        self._update_idle_monitor_state()
+        return False # Run once
+
     def _update_idle_monitor_state(self):
         """Starts or stops the idle monitor based on current settings."""
         if not self.settings_manager: return
         new_enabled_state = self.settings_manager.get_idle_monitor_enabled()
         new_threshold = self.settings_manager.get_idle_threshold_seconds()
-        print(f"Updating idle monitor state. New enabled={new_enabled_state}, threshold={new_threshold}")
+        log.debug("Updating idle monitor state. New enabled=%s, threshold=%s", new_enabled_state, new_threshold)
 
         if self.idle_monitor: # Check if monitor exists
-            # Check if settings actually changed relevant to monitor
-            needs_restart = (self._idle_monitor_enabled != new_enabled_state or
-                             (new_enabled_state and self._idle_threshold_seconds != new_threshold))
-
-            if needs_restart or not new_enabled_state:
-                print("Stopping existing idle monitor...")
+            # Only enabling/disabling needs a new monitor
+            if self._idle_monitor_enabled != new_enabled_state or not new_enabled_state:
+                log.info("Stopping existing idle monitor...")
                 self.idle_monitor.stop()
                 self.idle_monitor = None
+            elif self._idle_threshold_seconds != new_threshold:
+                 log.info("Updating idle threshold in place to %ss.", new_threshold)
+                 self.idle_monitor.set_threshold(new_threshold)
+                 self._idle_threshold_seconds = new_threshold
+                 return
             else:
-                 print("Idle monitor settings unchanged, leaving monitor running.")
+                 log.debug("Idle monitor settings unchanged, leaving monitor running.")
                  return # No need to restart if only interval changed, for example
 
         # Update internal state variables
@@ -505,23 +622,25 @@ class MindfulBreakApp(Gtk.Application):
         if self._idle_monitor_enabled:
              # Only create/start if needed (i.e., wasn't running or needs restart)
              if self.idle_monitor is None:
-                 print(f"Starting idle monitor with threshold {self._idle_threshold_seconds}s...")
+                 log.info("Starting idle monitor with threshold %ss...", self._idle_threshold_seconds)
+                 from idle_monitor import IdleMonitor
                  self.idle_monitor = IdleMonitor(idle_threshold_seconds=self._idle_threshold_seconds)
                  if self.idle_monitor._initialized_successfully:
                      # Reconnect signals
-                     self.idle_monitor.connect('user_idle', self.on_user_idle)
-                     self.idle_monitor.connect('user_active', self.on_user_active)
-                     self.idle_monitor.start(poll_interval_seconds=IDLE_POLL_INTERVAL_SECONDS)
+                     self._connect_bindings(self._IDLE_MONITOR_BINDINGS)
+                     self.idle_monitor.start()
                  else:
-                     print("Warning: Idle monitor failed to initialize. Idle detection disabled.")
+                     log.warning("Idle monitor failed to initialize. Idle detection disabled.")
                      self.idle_monitor = None
         else:
-            print("Idle monitor remains disabled.")
+            log.debug("Idle monitor remains disabled.")
             self._paused_due_to_idle = False
 
 
 # --- Main Execution ---
 if __name__ == '__main__':
+    # DEBUG messages from the event handlers cost only a level check at INFO
+    logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
     print("Starting Mindful Break Application...")
     app = MindfulBreakApp()
     exit_status = app.run(sys.argv)
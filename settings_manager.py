@@ -1,7 +1,38 @@
 # File: settings_manager.py
-import sys
 import os
 import json
+import logging
+import dataclasses
+from types import MappingProxyType
+
+try:
+    import orjson # Optional: faster JSON, encodes straight to bytes
+except ImportError:
+    orjson = None
+
+try:
+    import gi
+    gi.require_version('Gio', '2.0')
+    from gi.repository import Gio # Optional: watches the settings file
+except (ImportError, ValueError):
+    Gio = None
+
+log = logging.getLogger(__name__)
+
+# Settings location, resolved once at import
+CONFIG_DIR = os.path.join(os.path.expanduser("~"), ".config", "mindfulbreaks")
+CONFIG_PATH = os.path.join(CONFIG_DIR, "settings.json")
+
+@dataclasses.dataclass(slots=True)
+class Settings:
+    """In-memory settings, one typed field per SettingsManager key."""
+    break_interval: int
+    idle_enabled: bool
+    idle_threshold: int
+    overlay_width: int
+    overlay_height: int
+    overlay_top_margin: int
+    overlay_horizontal_centered: bool
 
 class SettingsManager:
     """
@@ -17,99 +48,235 @@ class SettingsManager:
     KEY_OVERLAY_TOP_MARGIN = 'overlay-top-margin'
     KEY_OVERLAY_HORIZONTAL_CENTERED = 'overlay-horizontal-centered'    
 
+    # Default application settings (read-only, built once)
+    _DEFAULTS = MappingProxyType({
+        KEY_BREAK_INTERVAL: 60,
+        KEY_IDLE_ENABLED: True,
+        KEY_IDLE_THRESHOLD: 3600,
+        # --- Added for Overlay Geometry ---
+        KEY_OVERLAY_WIDTH: 1000,
+        KEY_OVERLAY_HEIGHT: 600,
+        KEY_OVERLAY_TOP_MARGIN: 0,
+        KEY_OVERLAY_HORIZONTAL_CENTERED: True
+    })
+
+    # Lower bounds enforced on save (and on read for the idle threshold)
+    MIN_BREAK_INTERVAL = 1
+    MIN_IDLE_THRESHOLD = 10
+
+    # (Settings field, on-disk key) pairs
+    _FIELD_KEYS = (
+        ('break_interval', KEY_BREAK_INTERVAL),
+        ('idle_enabled', KEY_IDLE_ENABLED),
+        ('idle_threshold', KEY_IDLE_THRESHOLD),
+        ('overlay_width', KEY_OVERLAY_WIDTH),
+        ('overlay_height', KEY_OVERLAY_HEIGHT),
+        ('overlay_top_margin', KEY_OVERLAY_TOP_MARGIN),
+        ('overlay_horizontal_centered', KEY_OVERLAY_HORIZONTAL_CENTERED),
+    )
+
     def __init__(self):
         """
         Initializes the SettingsManager.
 
-        Loads settings from the JSON file or creates a default one.
+        Settings are loaded from the JSON file (or a default one is created)
+        on first access, not here.
         """
-        # Determine config path
-        config_dir = os.path.join(os.path.expanduser("~"), ".config", "mindfulbreaks")
-        self.config_path = os.path.join(config_dir, "settings.json")
-        self._settings = {} # In-memory cache for settings
+        self._config_dir = CONFIG_DIR
+        self.config_path = CONFIG_PATH
+        self._settings = None # In-memory cache for settings (Settings)
+        self._extra_settings = {} # Unknown keys from the file, written back as-is
+        self._snapshot = None # See _refresh_snapshot
+        self._last_saved_data = None # Serialized settings as last read/written on disk
+        self._last_seen_raw = None # File bytes last handled by _on_file_changed
+        self._loaded = False
+        self._file_monitor = None # Gio.FileMonitor on config_path (see _start_file_monitor)
+        self._change_callbacks = [] # See on_changed
 
+    def _ensure_loaded(self):
+        """Loads the settings on first use."""
+        if self._loaded:
+            return
         try:
             # Ensure directory exists
-            os.makedirs(config_dir, exist_ok=True)
+            os.makedirs(self._config_dir, exist_ok=True)
         except OSError as e:
-            raise RuntimeError(f"Fatal: Could not create config directory at '{config_dir}'. Error: {e}")
-
+            raise RuntimeError(f"Fatal: Could not create config directory at '{self._config_dir}'. Error: {e}")
+        self._loaded = True
         self._load_settings()
+        self._start_file_monitor()
 
-    def _get_default_settings(self) -> dict:
-        """Returns a dictionary with the default application settings."""
-        return {
-            self.KEY_BREAK_INTERVAL: 60,
-            self.KEY_IDLE_ENABLED: True,
-            self.KEY_IDLE_THRESHOLD: 3600,
-            # --- Added for Overlay Geometry ---
-            self.KEY_OVERLAY_WIDTH: 1000,
-            self.KEY_OVERLAY_HEIGHT: 600,
-            self.KEY_OVERLAY_TOP_MARGIN: 0,
-            self.KEY_OVERLAY_HORIZONTAL_CENTERED: True            
-        }
+    def _start_file_monitor(self):
+        """
+        Watches the settings file (inotify on Linux) so edits made by another
+        process or instance are picked up without re-reading on every access.
+        Events are delivered by the GLib main loop.
+        """
+        if Gio is None:
+            return
+        try:
+            gfile = Gio.File.new_for_path(self.config_path)
+            self._file_monitor = gfile.monitor_file(Gio.FileMonitorFlags.NONE, None)
+        except Exception as e:
+            log.warning("Could not watch settings file '%s' for changes. Error: %s", self.config_path, e)
+            return
+        self._file_monitor.connect('changed', self._on_file_changed)
+
+    def _on_file_changed(self, monitor, gfile, other_file, event_type):
+        """Reloads the settings once a write to the file is complete."""
+        if event_type != Gio.FileMonitorEvent.CHANGES_DONE_HINT:
+            return
+        try:
+            with open(self.config_path, 'rb') as f:
+                raw = f.read()
+        except IOError:
+            return # Deleted or replaced mid-event, a later event follows
+        if raw == self._last_saved_data or raw == self._last_seen_raw:
+            return # Our own save, or a rewrite with identical content
+        self._last_seen_raw = raw
+        try:
+            loaded_settings = orjson.loads(raw) if orjson else json.loads(raw)
+        except ValueError as e: # JSON errors (orjson's too) and non-UTF-8 bytes
+            # Unlike the first load, don't fall back to defaults: keep what we have
+            log.warning("Settings file changed but could not be parsed, keeping current settings. Error: %s", e)
+            return
+        if not isinstance(loaded_settings, dict):
+            log.warning("Settings file changed but does not hold a JSON object, keeping current settings.")
+            return
+        log.info("Settings file changed on disk, reloading.")
+        values = dict(self._DEFAULTS)
+        values.update(loaded_settings)
+        self._set_from_dict(values)
+        self._last_saved_data = self._serialize()
+        self._refresh_snapshot()
+        for callback in self._change_callbacks:
+            callback(self)
+
+    def on_changed(self, callback):
+        """
+        Registers callback(settings_manager) to be called after the settings
+        were reloaded because the file was changed by someone else (saves
+        through this SettingsManager don't trigger it).
+        """
+        self._change_callbacks.append(callback)
+
+    def off_changed(self, callback):
+        """Unregisters a callback added with on_changed (no-op if it isn't registered)."""
+        if callback in self._change_callbacks:
+            self._change_callbacks.remove(callback)
+
+    @property
+    def snapshot(self) -> Settings:
+        """Attribute view of the current settings (read-only for callers)."""
+        self._ensure_loaded()
+        return self._snapshot
 
     def _load_settings(self):
         """Loads settings from the JSON file into the in-memory cache."""
-        defaults = self._get_default_settings()
+        defaults = dict(self._DEFAULTS)
         try:
             if os.path.exists(self.config_path):
-                with open(self.config_path, 'r') as f:
-                    loaded_settings = json.load(f)
-                # Merge loaded settings with defaults to ensure all keys exist
-                self._settings = {**defaults, **loaded_settings}
-                print(f"Settings loaded from {self.config_path}")
+                with open(self.config_path, 'rb') as f:
+                    raw = f.read()
+                # orjson.JSONDecodeError subclasses json.JSONDecodeError
+                loaded_settings = orjson.loads(raw) if orjson else json.loads(raw)
+                # Merge loaded settings over the (fresh) defaults copy in place
+                # to ensure all keys exist
+                defaults.update(loaded_settings)
+                self._set_from_dict(defaults)
+                self._last_saved_data = self._serialize()
+                log.debug("Settings loaded from %s", self.config_path)
             else:
                 # If file doesn't exist, create it with defaults
-                print(f"Settings file not found. Creating default at {self.config_path}")
-                self._settings = defaults
+                log.info("Settings file not found. Creating default at %s", self.config_path)
+                self._set_from_dict(defaults)
                 self._save_settings()
         except (json.JSONDecodeError, IOError) as e:
-            print(f"Warning: Could not read or parse settings file. Using defaults. Error: {e}", file=sys.stderr)
-            self._settings = defaults
+            log.warning("Could not read or parse settings file. Using defaults. Error: %s", e)
+            self._set_from_dict(defaults)
+        self._refresh_snapshot()
+
+    def _set_from_dict(self, values: dict):
+        """Replaces the in-memory settings with a complete key -> value dict."""
+        self._settings = Settings(**{field: values[key] for field, key in self._FIELD_KEYS})
+        known_keys = {key for _, key in self._FIELD_KEYS}
+        self._extra_settings = {key: value for key, value in values.items() if key not in known_keys}
+
+    def _to_dict(self) -> dict:
+        """Returns the in-memory settings as an on-disk key -> value dict."""
+        values = {key: getattr(self._settings, field) for field, key in self._FIELD_KEYS}
+        values.update(self._extra_settings)
+        return values
+
+    def _refresh_snapshot(self):
+        """Rebuilds self.snapshot (a copy of the in-memory settings)."""
+        # Ensure value is reasonable on read, min 10s
+        self._snapshot = dataclasses.replace(
+            self._settings, idle_threshold=max(self.MIN_IDLE_THRESHOLD, self._settings.idle_threshold))
+
+    def _serialize(self) -> bytes:
+        """Returns the in-memory settings in their on-disk JSON form."""
+        values = self._to_dict()
+        if orjson:
+            return orjson.dumps(values, option=orjson.OPT_INDENT_2)
+        return json.dumps(values, indent=4).encode()
 
     def _save_settings(self):
         """Saves the current in-memory settings to the JSON file."""
+        # Every mutation ends up here, so this keeps the snapshot current
+        self._refresh_snapshot()
+        data = self._serialize()
+        if data == self._last_saved_data:
+            return # Nothing changed since the last load/save
+        # Write a temporary file and rename it over the real one, so a crash
+        # mid-write can never leave a truncated settings file behind
+        tmp_path = self.config_path + '.tmp'
         try:
-            with open(self.config_path, 'w') as f:
-                json.dump(self._settings, f, indent=4)
-            print(f"Settings saved to {self.config_path}")
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, self.config_path)
+            self._last_saved_data = data
+            log.debug("Settings saved to %s", self.config_path)
         except IOError as e:
-            print(f"Error: Could not write settings to '{self.config_path}'. Error: {e}", file=sys.stderr)
+            log.error("Could not write settings to '%s'. Error: %s", self.config_path, e)
 
     # --- Public Getter Methods ---
 
     def get_break_interval(self) -> int:
         """Retrieves the currently configured break interval in minutes."""
-        return self._settings.get(self.KEY_BREAK_INTERVAL, self._get_default_settings()[self.KEY_BREAK_INTERVAL])
+        return self.snapshot.break_interval
 
     def get_idle_monitor_enabled(self) -> bool:
         """Retrieves whether the idle monitor is enabled."""
-        return self._settings.get(self.KEY_IDLE_ENABLED, self._get_default_settings()[self.KEY_IDLE_ENABLED])
+        return self.snapshot.idle_enabled
 
     def get_idle_threshold_seconds(self) -> int:
-        """Retrieves the idle threshold in seconds."""
-        # Ensure value is reasonable on read, min 10s
-        value = self._settings.get(self.KEY_IDLE_THRESHOLD, self._get_default_settings()[self.KEY_IDLE_THRESHOLD])
-        return max(10, value)
+        """Retrieves the idle threshold in seconds (at least 10)."""
+        return self.snapshot.idle_threshold
 
     # --- Added for Overlay Geometry ---
 
     def get_overlay_width(self) -> int:
         """Retrieves the overlay width in pixels."""
-        return self._settings.get(self.KEY_OVERLAY_WIDTH, self._get_default_settings()[self.KEY_OVERLAY_WIDTH])
+        return self.snapshot.overlay_width
 
     def get_overlay_height(self) -> int:
         """Retrieves the overlay height in pixels."""
-        return self._settings.get(self.KEY_OVERLAY_HEIGHT, self._get_default_settings()[self.KEY_OVERLAY_HEIGHT])
+        return self.snapshot.overlay_height
 
     def get_overlay_top_margin(self) -> int:
         """Retrieves the overlay top margin in pixels."""
-        return self._settings.get(self.KEY_OVERLAY_TOP_MARGIN, self._get_default_settings()[self.KEY_OVERLAY_TOP_MARGIN])
+        return self.snapshot.overlay_top_margin
 
     def get_overlay_horizontal_centered(self) -> bool:
         """Retrieves whether the overlay should be horizontally centered."""
-        return self._settings.get(self.KEY_OVERLAY_HORIZONTAL_CENTERED, self._get_default_settings()[self.KEY_OVERLAY_HORIZONTAL_CENTERED])
+        return self.snapshot.overlay_horizontal_centered
 
     # --- Public Setter Methods ---
 
@@ -119,33 +286,62 @@ class SettingsManager:
         Args:
             minutes: The desired break interval in minutes (integer >= 1).
         """
-        try:
-            validated_minutes = max(1, int(minutes))
-        except (ValueError, TypeError):
-            print(f"Warning: Invalid type/value for minutes ('{minutes}'). Using default.", file=sys.stderr)
-            validated_minutes = self._get_default_settings()[self.KEY_BREAK_INTERVAL]
-
-        self._settings[self.KEY_BREAK_INTERVAL] = validated_minutes
+        self._ensure_loaded()
+        self._settings.break_interval = self._validate_break_interval(minutes)
         self._save_settings()
 
     def set_idle_monitor_enabled(self, enabled: bool):
         """Sets whether the idle monitor is enabled and saves to file."""
-        self._settings[self.KEY_IDLE_ENABLED] = bool(enabled)
+        self._ensure_loaded()
+        self._settings.idle_enabled = bool(enabled)
         self._save_settings()
 
     def set_idle_threshold_seconds(self, seconds: int):
         """Sets the idle threshold in seconds and saves to file."""
+        self._ensure_loaded()
+        self._settings.idle_threshold = self._validate_idle_threshold(seconds)
+        self._save_settings()
+
+    def update(self, break_interval: int = None, idle_enabled: bool = None, idle_threshold: int = None):
+        """
+        Sets several settings at once and saves to file a single time.
+
+        Args:
+            break_interval: Break interval in minutes (integer >= 1).
+            idle_enabled: Whether the idle monitor is enabled.
+            idle_threshold: Idle threshold in seconds (integer >= 10).
+            Settings passed as None are left unchanged.
+        """
+        self._ensure_loaded()
+        if break_interval is not None:
+            self._settings.break_interval = self._validate_break_interval(break_interval)
+        if idle_enabled is not None:
+            self._settings.idle_enabled = bool(idle_enabled)
+        if idle_threshold is not None:
+            self._settings.idle_threshold = self._validate_idle_threshold(idle_threshold)
+        self._save_settings()
+
+    # --- Validation Helpers ---
+
+    def _validate_break_interval(self, minutes) -> int:
+        """Returns minutes as an int >= 1, or the default if it isn't a number."""
         try:
-            validated_seconds = max(10, int(seconds))
+            return max(self.MIN_BREAK_INTERVAL, int(minutes))
         except (ValueError, TypeError):
-            print(f"Warning: Invalid value '{seconds}' for idle threshold, using 10.", file=sys.stderr)
-            validated_seconds = 10
+            log.warning("Invalid type/value for minutes ('%s'). Using default.", minutes)
+            return self._DEFAULTS[self.KEY_BREAK_INTERVAL]
 
-        self._settings[self.KEY_IDLE_THRESHOLD] = validated_seconds
-        self._save_settings()
+    def _validate_idle_threshold(self, seconds) -> int:
+        """Returns seconds as an int >= 10, or 10 if it isn't a number."""
+        try:
+            return max(self.MIN_IDLE_THRESHOLD, int(seconds))
+        except (ValueError, TypeError):
+            log.warning("Invalid value '%s' for idle threshold, using %s.", seconds, self.MIN_IDLE_THRESHOLD)
+            return self.MIN_IDLE_THRESHOLD
 
 # --- Test Code Block ---
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG, format="%(name)s: %(message)s")
     print("Running basic SettingsManager test...")
     try:
         manager = SettingsManager()
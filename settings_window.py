@@ -15,7 +15,7 @@ from gi.repository import Gtk, GObject, Gio, GLib # Import GLib
 
 # Import the settings manager from Ticket 1
 try:
-    from settings_manager import SettingsManager
+    from settings_manager import SettingsManager, CONFIG_PATH
 except ImportError as e:
      print(f"Error: Could not import SettingsManager. Make sure settings_manager.py is in the same directory or Python path. {e}", file=sys.stderr)
      sys.exit(1)
@@ -53,54 +53,21 @@ class SettingsWindow(Gtk.Window): # Inherit from Gtk.Window
         vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
         self.add(vbox)
 
-        # --- Break Interval Row ---
-        hbox_interval = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-        vbox.pack_start(hbox_interval, True, True, 0)
-
-        label_interval = Gtk.Label(label="Interval Between Breaks (minutes):")
-        label_interval.set_xalign(0)
-        hbox_interval.pack_start(label_interval, False, False, 0)
-
-        self.spin_break_interval = Gtk.SpinButton()
-        adjustment_interval = Gtk.Adjustment(
+        # --- Setting Rows ---
+        self.spin_break_interval = self._add_spin_row(
+            vbox, "Interval Between Breaks (minutes):",
             value=self._settings_manager.get_break_interval(),
-            lower=1.0, upper=180.0, step_increment=1.0, page_increment=5.0, page_size=0.0
+            lower=1.0, upper=180.0, step=1.0, page=5.0, expand=True, padding=0
         )
-        self.spin_break_interval.set_adjustment(adjustment_interval)
-        self.spin_break_interval.set_digits(0)
-        self.spin_break_interval.set_numeric(True)
-        hbox_interval.pack_start(self.spin_break_interval, True, True, 0)
-
-        # --- Enable Idle Detection Row ---
-        hbox_idle_enable = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-        vbox.pack_start(hbox_idle_enable, False, False, 5) # Less vertical space
-
-        label_idle_enable = Gtk.Label(label="Enable Idle Detection:")
-        label_idle_enable.set_xalign(0)
-        hbox_idle_enable.pack_start(label_idle_enable, True, True, 0) # Allow label to expand
-
-        self.switch_idle_enable = Gtk.Switch()
-        self.switch_idle_enable.set_valign(Gtk.Align.CENTER)
-        self.switch_idle_enable.set_active(self._settings_manager.get_idle_monitor_enabled())
-        hbox_idle_enable.pack_end(self.switch_idle_enable, False, False, 0) # Pack switch at end
-
-        # --- Idle Threshold Row ---
-        hbox_idle_threshold = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-        vbox.pack_start(hbox_idle_threshold, False, False, 5)
-
-        label_idle_threshold = Gtk.Label(label="Idle Threshold (seconds):")
-        label_idle_threshold.set_xalign(0)
-        hbox_idle_threshold.pack_start(label_idle_threshold, False, False, 0)
-
-        self.spin_idle_threshold = Gtk.SpinButton()
-        adjustment_threshold = Gtk.Adjustment(
+        self.switch_idle_enable = self._add_switch_row(
+            vbox, "Enable Idle Detection:",
+            active=self._settings_manager.get_idle_monitor_enabled()
+        )
+        self.spin_idle_threshold = self._add_spin_row(
+            vbox, "Idle Threshold (seconds):",
             value=self._settings_manager.get_idle_threshold_seconds(),
-            lower=10.0, upper=7200.0, step_increment=5.0, page_increment=30.0, page_size=0.0
+            lower=10.0, upper=7200.0, step=5.0, page=30.0
         )
-        self.spin_idle_threshold.set_adjustment(adjustment_threshold)
-        self.spin_idle_threshold.set_digits(0)
-        self.spin_idle_threshold.set_numeric(True)
-        hbox_idle_threshold.pack_start(self.spin_idle_threshold, True, True, 0)
 
         # --- Separator and Buttons ---
         vbox.pack_start(Gtk.Separator(orientation=Gtk.Orientation.HORIZONTAL), False, False, 15) # More space before buttons
@@ -117,54 +84,111 @@ class SettingsWindow(Gtk.Window): # Inherit from Gtk.Window
         action_area.pack_end(btn_cancel, False, False, 0)
 
         # --- Connect Signals ---
-        # Store initial values for *all* settings to detect changes
-        self._initial_interval = self.spin_break_interval.get_value_as_int()
-        self._initial_idle_enabled = self.switch_idle_enable.get_active()
-        self._initial_idle_threshold = self.spin_idle_threshold.get_value_as_int()
+        self._store_initial_values()
+        self._settings_manager.on_changed(self._on_settings_file_changed)
 
         btn_save.connect("clicked", self._on_save_clicked)
         btn_cancel.connect("clicked", self._on_cancel_clicked)
         self.connect("delete-event", self._on_delete_event) # Handle window 'X' button
+        self.connect("destroy", self._on_destroy)
 
         print("SettingsWindow (GTK3): Initialized.")
         self.show_all() # Make window and widgets visible
 
 
+    def show_with_current_values(self):
+        """
+        Shows the (hidden) window again with the current saved settings.
+
+        The window is hidden rather than destroyed when closed, so reopening
+        it only refreshes the widget values.
+        """
+        self.spin_break_interval.set_value(self._settings_manager.get_break_interval())
+        self.switch_idle_enable.set_active(self._settings_manager.get_idle_monitor_enabled())
+        self.spin_idle_threshold.set_value(self._settings_manager.get_idle_threshold_seconds())
+        self._store_initial_values()
+        self.present()
+
+    def _on_settings_file_changed(self, settings_manager):
+        """Shows settings changed outside the app, unless the user has edited the form."""
+        if self.get_visible() and self._current_values() == self._initial_values:
+            self.show_with_current_values()
+
+    def _store_initial_values(self):
+        """Stores the values shown for *all* settings to detect changes on Save."""
+        self._initial_values = self._current_values()
+
+    def _current_values(self) -> tuple:
+        """Returns (interval, idle enabled, idle threshold) as shown in the widgets."""
+        return (
+            self.spin_break_interval.get_value_as_int(),
+            self.switch_idle_enable.get_active(),
+            self.spin_idle_threshold.get_value_as_int()
+        )
+
+    def _add_spin_row(self, parent_box, label_text, value, lower, upper, step, page,
+                      expand=False, padding=5) -> Gtk.SpinButton:
+        """Packs a 'label + integer spin button' row into parent_box and returns the spin button."""
+        hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
+        parent_box.pack_start(hbox, expand, expand, padding)
+
+        label = Gtk.Label(label=label_text)
+        label.set_xalign(0)
+        hbox.pack_start(label, False, False, 0)
+
+        spin = Gtk.SpinButton()
+        spin.set_adjustment(Gtk.Adjustment(
+            value=value, lower=lower, upper=upper,
+            step_increment=step, page_increment=page, page_size=0.0
+        ))
+        spin.set_digits(0)
+        spin.set_numeric(True)
+        hbox.pack_start(spin, True, True, 0)
+        return spin
+
+    def _add_switch_row(self, parent_box, label_text, active) -> Gtk.Switch:
+        """Packs a 'label + switch' row into parent_box and returns the switch."""
+        hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
+        parent_box.pack_start(hbox, False, False, 5) # Less vertical space
+
+        label = Gtk.Label(label=label_text)
+        label.set_xalign(0)
+        hbox.pack_start(label, True, True, 0) # Allow label to expand
+
+        switch = Gtk.Switch()
+        switch.set_valign(Gtk.Align.CENTER)
+        switch.set_active(active)
+        hbox.pack_end(switch, False, False, 0) # Pack switch at end
+        return switch
+
+
     def _on_save_clicked(self, widget):
         """Saves all settings if changed and closes the window."""
         print("SettingsWindow: Save clicked.")
 
-        # Get current values
-        current_interval = self.spin_break_interval.get_value_as_int()
-        current_idle_enabled = self.switch_idle_enable.get_active()
-        current_idle_threshold = self.spin_idle_threshold.get_value_as_int()
-
-        # Check if anything changed
-        interval_changed = current_interval != self._initial_interval
-        idle_enabled_changed = current_idle_enabled != self._initial_idle_enabled
-        idle_threshold_changed = current_idle_threshold != self._initial_idle_threshold
-
-        if not (interval_changed or idle_enabled_changed or idle_threshold_changed):
+        # Get current values and check if anything changed
+        current_values = self._current_values()
+        if current_values == self._initial_values:
             print("SettingsWindow: No changes detected.")
-            self.destroy() # Close without saving if nothing changed
+            self.hide() # Close without saving if nothing changed
             return
 
         print("SettingsWindow: Changes detected, saving...")
         try:
-            # Save all changed values (SettingsManager handles sync internally)
-            if interval_changed:
-                self._settings_manager.set_break_interval(current_interval)
-            if idle_enabled_changed:
-                 self._settings_manager.set_idle_monitor_enabled(current_idle_enabled)
-            if idle_threshold_changed:
-                 self._settings_manager.set_idle_threshold_seconds(current_idle_threshold)
+            # Save all values with a single write to the settings file
+            current_interval, current_idle_enabled, current_idle_threshold = current_values
+            self._settings_manager.update(
+                break_interval=current_interval,
+                idle_enabled=current_idle_enabled,
+                idle_threshold=current_idle_threshold
+            )
 
             # Emit signal AFTER successfully saving
             self.emit('settings_saved', current_interval) # Keep original signature
-            self.destroy() # Close the window
+            self.hide() # Close the window (kept for the next time)
 
         except Exception as e:
-             # saved_successfully = False # Not needed if we always destroy
+             # saved_successfully = False # Not needed if we always close
              print(f"Error saving settings: {e}", file=sys.stderr)
              # Show error dialog
              dialog = Gtk.MessageDialog(
@@ -174,20 +198,25 @@ class SettingsWindow(Gtk.Window): # Inherit from Gtk.Window
              dialog.format_secondary_text(str(e))
              dialog.run()
              dialog.destroy()
-             # Still destroy the settings window even if save failed? Yes, probably less confusing.
-             self.destroy()
+             # Still close the settings window even if save failed? Yes, probably less confusing.
+             self.hide()
 
 
     def _on_cancel_clicked(self, widget):
         """Closes the window without saving."""
         print("SettingsWindow: Cancel clicked.")
-        self.destroy()
+        self.hide()
+
+    def _on_destroy(self, widget):
+        """Stops listening for settings file changes once the window is gone."""
+        self._settings_manager.off_changed(self._on_settings_file_changed)
 
     def _on_delete_event(self, widget, event):
         """Handles the window close ('X') button like Cancel."""
         print("SettingsWindow: Delete event (closed).")
-        # Return False to allow the window to close, True would prevent it
-        return False
+        # Hide instead of destroying, so the window can be shown again
+        self.hide()
+        return True
 
 
 # --- Test Code (GTK3 Version - Update to show new widgets) ---
@@ -203,7 +232,7 @@ if __name__ == '__main__':
         import json
         import os
         try:
-            config_path = os.path.join(os.path.expanduser("~"), ".config", "mindfulbreaks", "settings.json")
+            config_path = CONFIG_PATH
             print(f"Verifying saved settings by reading '{config_path}'...")
             settings_ok = True
             if not os.path.exists(config_path):
@@ -246,7 +275,7 @@ if __name__ == '__main__':
 
         settings_win = SettingsWindow(settings_manager=settings_mgr)
         settings_win.connect('settings_saved', on_settings_saved)
-        settings_win.connect('destroy', lambda w: main_loop.quit() if main_loop.is_running() else None)
+        settings_win.connect('hide', lambda w: main_loop.quit() if main_loop.is_running() else None)
 
         print("Settings window presented. Use Save/Cancel or close the window.")
         print("\nStarting Gtk MainLoop...")
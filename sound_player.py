@@ -1,10 +1,16 @@
 import sys
 import os
-from playsound import playsound, PlaysoundException
+import stat
+import threading
+import concurrent.futures
 
 class SoundPlayer:
     """
-    A simple utility class to play a notification sound using the 'playsound' library.
+    A simple utility class to play a notification sound.
+
+    WAV files are decoded once and played from memory with 'simpleaudio' when
+    it is installed. Otherwise (or for other formats) a GStreamer playbin,
+    built once and reused, plays the file; 'playsound' is the last resort.
     """
 
     def __init__(self, sound_file_path: str):
@@ -15,35 +21,182 @@ class SoundPlayer:
             sound_file_path: The path to the sound file (e.g., .wav, .mp3).
         """
         self.sound_file_path = sound_file_path
+        # playsound is imported on the first playback (see _load_playsound)
+        self._playsound = None
+        self._playsound_exception = None
+        self._playsound_import_attempted = False
+        # simpleaudio WaveObject holding the decoded sound (see _load_wave)
+        self._wave_obj = None
+        self._wave_load_attempted = False
+        # Reusable GStreamer playbin (see _load_gst)
+        self._gst = None
+        self._gst_pipeline = None
+        self._gst_load_attempted = False
+        self._is_playable = False # Set by _verify_file
+        # Playback runs on one worker thread so callers (the GTK main loop)
+        # never block; a request made while a sound is playing is dropped
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="SoundPlayer")
+        self._playing_lock = threading.Lock()
+        self._playing = False
         self._verify_file()
 
     def _verify_file(self):
-        """Checks if the sound file exists and is readable."""
-        if not os.path.exists(self.sound_file_path):
+        """
+        Checks (with a single stat) that the sound file exists and is a regular
+        file, and caches the result for play_break_sound.
+        """
+        try:
+            st = os.stat(self.sound_file_path)
+        except FileNotFoundError:
             print(f"Warning: Sound file not found at '{self.sound_file_path}'. Playback will fail.", file=sys.stderr)
             # Optional: Raise an error instead? For now, just warn.
             # raise FileNotFoundError(f"Sound file not found: {self.sound_file_path}")
-        elif not os.path.isfile(self.sound_file_path):
+            return
+        except OSError as e:
+            print(f"Warning: Cannot access sound file '{self.sound_file_path}': {e}. Playback will fail.", file=sys.stderr)
+            return
+        if not stat.S_ISREG(st.st_mode):
             print(f"Warning: Path '{self.sound_file_path}' is not a file. Playback will fail.", file=sys.stderr)
-        elif not os.access(self.sound_file_path, os.R_OK):
-             print(f"Warning: Sound file at '{self.sound_file_path}' is not readable. Playback might fail.", file=sys.stderr)
+            return
+        # Other problems (e.g. permissions) surface as playback errors
+        self._is_playable = True
+
+
+    def _load_playsound(self) -> bool:
+        """
+        Imports playsound on first use.
+
+        Returns:
+            bool: True if playsound is available. A failed import is reported
+                  once and not retried.
+        """
+        if not self._playsound_import_attempted:
+            self._playsound_import_attempted = True
+            try:
+                from playsound import playsound, PlaysoundException
+            except ImportError as e:
+                print(f"Error: Could not import 'playsound', break sounds are disabled. {e}", file=sys.stderr)
+                print("Please install it: pip install playsound==1.2.2", file=sys.stderr)
+                return False
+            self._playsound = playsound
+            self._playsound_exception = PlaysoundException
+        return self._playsound is not None
+
+    def _load_wave(self) -> bool:
+        """
+        Decodes a WAV sound file into memory with simpleaudio on first use.
+
+        Returns:
+            bool: True if the in-memory sound is available. False (without
+                  retrying) if simpleaudio is missing, the file isn't a WAV
+                  file or decoding failed; playsound is used instead.
+        """
+        if not self._wave_load_attempted:
+            self._wave_load_attempted = True
+            if not self.sound_file_path.lower().endswith('.wav'):
+                return False
+            try:
+                import simpleaudio
+            except ImportError:
+                return False # Optional dependency
+            try:
+                self._wave_obj = simpleaudio.WaveObject.from_wave_file(self.sound_file_path)
+            except Exception as e:
+                print(f"Warning: Could not decode '{self.sound_file_path}', falling back to playsound. {e}", file=sys.stderr)
+        return self._wave_obj is not None
+
+    def _load_gst(self) -> bool:
+        """
+        Builds a GStreamer playbin for the sound file on first use.
 
+        Returns:
+            bool: True if the pipeline is available, False (without retrying)
+                  if GStreamer or its GI bindings are missing.
+        """
+        if not self._gst_load_attempted:
+            self._gst_load_attempted = True
+            try:
+                import gi
+                gi.require_version('Gst', '1.0')
+                from gi.repository import Gst
+            except (ImportError, ValueError):
+                return False # Optional dependency
+            Gst.init(None)
+            pipeline = Gst.ElementFactory.make('playbin', None)
+            if pipeline is None:
+                print("Warning: GStreamer 'playbin' element not available, falling back to playsound.", file=sys.stderr)
+                return False
+            pipeline.set_property('uri', Gst.filename_to_uri(os.path.abspath(self.sound_file_path)))
+            self._gst = Gst
+            self._gst_pipeline = pipeline
+        return self._gst_pipeline is not None
 
     def play_break_sound(self):
         """
-        Plays the configured sound file synchronously (blocking).
-        Includes basic error handling.
+        Plays the configured sound file on the background worker and returns
+        immediately. Ignored if the previous sound is still playing.
         """
-        if not os.path.exists(self.sound_file_path) or not os.path.isfile(self.sound_file_path):
+        if not self._is_playable:
              print(f"Error: Cannot play sound, file not found or not a file: '{self.sound_file_path}'", file=sys.stderr)
              return
 
+        with self._playing_lock:
+            if self._playing:
+                print("SoundPlayer: Sound already playing, ignoring request.")
+                return
+            self._playing = True
+        self._executor.submit(self._play_sync)
+
+    def shutdown(self):
+        """Stops accepting playback requests (a sound already playing finishes)."""
+        self._executor.shutdown(wait=False)
+
+    def _play_sync(self):
+        """Plays the sound file (blocking); runs on the worker thread."""
+        try:
+            if self._load_wave():
+                self._play_from_memory()
+            elif self._load_gst():
+                self._play_with_gst()
+            elif self._load_playsound():
+                self._play_with_playsound()
+        finally:
+            with self._playing_lock:
+                self._playing = False
+
+    def _play_from_memory(self):
+        """Blocking playback of the decoded WAV data, with basic error handling."""
+        try:
+            self._wave_obj.play().wait_done()
+        except Exception as e:
+            print(f"Error: An unexpected error occurred during sound playback: {e}", file=sys.stderr)
+
+    def _play_with_gst(self):
+        """Blocking playback through the cached playbin, with basic error handling."""
+        Gst = self._gst
+        try:
+            self._gst_pipeline.set_state(Gst.State.PLAYING)
+            # We're on the worker thread, so wait on the bus directly instead
+            # of adding a main loop watch
+            message = self._gst_pipeline.get_bus().timed_pop_filtered(
+                Gst.CLOCK_TIME_NONE, Gst.MessageType.EOS | Gst.MessageType.ERROR)
+            if message and message.type == Gst.MessageType.ERROR:
+                error, _debug = message.parse_error()
+                print(f"Error: Failed to play sound '{self.sound_file_path}'. GStreamer error: {error.message}", file=sys.stderr)
+        except Exception as e:
+            print(f"Error: An unexpected error occurred during sound playback: {e}", file=sys.stderr)
+        finally:
+            # Back to NULL so the next play starts from the beginning
+            self._gst_pipeline.set_state(Gst.State.NULL)
+
+    def _play_with_playsound(self):
+        """Blocking playback through playsound, with basic error handling."""
         print(f"SoundPlayer: Attempting to play '{self.sound_file_path}' (blocking)...")
         try:
             # Set block=True (or omit it, as True is often the default)
-            playsound(self.sound_file_path, block=True)
+            self._playsound(self.sound_file_path, block=True)
             print(f"SoundPlayer: Playback finished for '{self.sound_file_path}'.")
-        except PlaysoundException as e:
+        except self._playsound_exception as e:
             print(f"Error: Failed to play sound '{self.sound_file_path}'. PlaysoundException: {e}", file=sys.stderr)
         except Exception as e:
             print(f"Error: An unexpected error occurred during sound playback: {e}", file=sys.stderr)
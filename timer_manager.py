@@ -1,6 +1,8 @@
 import sys
 import gi
-import time # Used only for test printing
+import math
+import logging
+import time
 
 try:
     gi.require_version('GLib', '2.0')
@@ -11,6 +13,43 @@ except ValueError as e:
 
 from gi.repository import GLib, GObject
 
+log = logging.getLogger(__name__)
+
+class _DeadlineSource(GLib.Source):
+    """
+    A GLib source that calls tick() once its ready time (see wake_in) is
+    reached. It stays attached for the lifetime of its TimerManager, so
+    starting, pausing and rescheduling never create or remove sources.
+    """
+
+    def __init__(self, tick):
+        super().__init__()
+        self._tick = tick
+        self.set_priority(GLib.PRIORITY_DEFAULT)
+        self.set_ready_time(-1) # Dormant until wake_in is called
+        self.attach(None) # Default main context
+
+    def wake_in(self, seconds: float):
+        """Dispatches once, 'seconds' from now."""
+        self.set_ready_time(GLib.get_monotonic_time() + int(seconds * 1_000_000))
+
+    def cancel(self):
+        """Cancels the pending wakeup (the source stays attached)."""
+        self.set_ready_time(-1)
+
+    # The ready time alone decides when we fire, so GLib computes the poll
+    # timeout itself
+    def prepare(self):
+        return False, -1
+
+    def check(self):
+        return False
+
+    def dispatch(self, callback, args):
+        self.set_ready_time(-1) # One tick per wake_in
+        self._tick()
+        return True # Keep the source attached
+
 class TimerManager(GObject.Object):
     """
     Manages the countdown timer logic, state machine, and notifications.
@@ -38,18 +77,42 @@ class TimerManager(GObject.Object):
         # 'timer_postponed': (GObject.SignalFlags.RUN_FIRST, None, (int,)), # Postponed minutes
     }
 
-    def __init__(self):
-        """Initializes the TimerManager."""
+    def __init__(self, minute_resolution: bool = False):
+        """
+        Initializes the TimerManager.
+
+        Args:
+            minute_resolution: If True, timer_tick reports the remaining time
+                               rounded up to whole minutes and the timer only
+                               wakes once a minute. For displays without seconds.
+        """
         # Initialize the parent GObject class
         GObject.Object.__init__(self)
 
         self._state = self.STATE_STOPPED
-        self._timer_source_id = None # Stores the ID returned by GLib.timeout_add
-        self._remaining_seconds = 0
+        self._tick_source = _DeadlineSource(self._tick) # Drives _tick, see _schedule_tick
+        self._remaining_seconds = 0 # Whole seconds left, as last emitted by timer_tick
+        self._deadline_monotonic = None # time.monotonic() at which the countdown ends (while running)
+        self._pause_remaining = None # Exact time left when paused, in seconds
         self._configured_interval_seconds = 0 # Default interval set via set_interval
+        self._tick_period = 60 if minute_resolution else 1 # Seconds between ticks
+        self._tick_listeners = [] # Direct timer_tick callbacks, see add_tick_listener
 
     # --- Public Methods ---
 
+    def add_tick_listener(self, callback):
+        """
+        Registers callback(remaining_seconds), called with every timer_tick.
+
+        Cheaper than connecting to the 'timer_tick' signal (no GObject
+        marshalling), which matters for the most frequent event.
+        """
+        self._tick_listeners.append(callback)
+
+    def remove_tick_listener(self, callback):
+        """Unregisters a callback added with add_tick_listener."""
+        self._tick_listeners.remove(callback)
+
     def set_interval(self, minutes: float): # Allow float for testing fractions
         """
         Sets the default interval for the timer. Does not start the timer.
@@ -57,9 +120,19 @@ class TimerManager(GObject.Object):
         Args:
             minutes: The interval duration in minutes (must result in >= 1 second).
         """
-        interval_seconds = int(round(minutes * 60)) # Convert to seconds and round nicely
+        self.set_interval_seconds(self._minutes_to_seconds(minutes))
+
+    def set_interval_seconds(self, interval_seconds: int):
+        """
+        Sets the default interval for the timer in whole seconds. Does not
+        start the timer.
+
+        Args:
+            interval_seconds: The interval duration in seconds (>= 1).
+        """
+        interval_seconds = int(interval_seconds)
         if interval_seconds < 1:
-            print(f"Warning: Calculated interval ({interval_seconds}s from {minutes}min) is less than 1 second. Setting to 1 second.", file=sys.stderr)
+            log.warning("Interval (%ss) is less than 1 second. Setting to 1 second.", interval_seconds)
             interval_seconds = 1
 
         self._configured_interval_seconds = interval_seconds
@@ -69,7 +142,7 @@ class TimerManager(GObject.Object):
         # If we are stopped, we can prime remaining_seconds for the next start.
         if self._state == self.STATE_STOPPED:
             self._remaining_seconds = self._configured_interval_seconds
-        print(f"Timer interval set to {minutes:.2f} minutes ({self._configured_interval_seconds} seconds)")
+        log.debug("Timer interval set to %s seconds", self._configured_interval_seconds)
 
 
     def start(self):
@@ -78,58 +151,59 @@ class TimerManager(GObject.Object):
         If already running, it effectively restarts the timer.
         If paused, it restarts from the configured interval.
         """
-        print("TimerManager: Start requested.")
-        self._stop_internal_timer() # Clear any existing timer source
+        log.debug("Start requested.")
 
         if self._configured_interval_seconds <= 0:
-            print("Warning: Cannot start timer, interval not set or is zero.", file=sys.stderr)
+            log.warning("Cannot start timer, interval not set or is zero.")
             return
 
         self._state = self.STATE_RUNNING
-        self._remaining_seconds = self._configured_interval_seconds
-        # Start the periodic timer, calling _tick every second (1000ms)
-        self._timer_source_id = GLib.timeout_add_seconds(1, self._tick)
+        self._run_for(self._configured_interval_seconds)
         self.emit('timer_started')
         # Emit initial tick immediately
-        self.emit('timer_tick', self._remaining_seconds)
-        print(f"TimerManager: Started with {self._remaining_seconds} seconds.")
+        self._emit_tick(self._remaining_seconds)
+        log.info("Started with %s seconds.", self._remaining_seconds)
 
 
     def pause(self):
         """
         Pauses the timer if it is currently running.
         """
-        print("TimerManager: Pause requested.")
+        log.debug("Pause requested.")
         if self._state == self.STATE_RUNNING:
             self._state = self.STATE_PAUSED
             self._stop_internal_timer() # Stop the GLib timer
+            # Keep the exact time left (not just whole seconds) for resume
+            self._pause_remaining = max(0.0, self._deadline_monotonic - time.monotonic())
+            self._remaining_seconds = self._quantize(self._pause_remaining)
+            self._deadline_monotonic = None
             self.emit('timer_paused')
-            print(f"TimerManager: Paused at {self._remaining_seconds} seconds.")
+            log.info("Paused at %s seconds.", self._remaining_seconds)
         else:
-            print(f"TimerManager: Cannot pause, not running (state={self._state})")
+            log.debug("Cannot pause, not running (state=%s)", self._state)
 
 
     def resume(self):
         """
         Resumes the timer if it is currently paused.
         """
-        print("TimerManager: Resume requested.")
+        log.debug("Resume requested.")
         if self._state == self.STATE_PAUSED:
             self._state = self.STATE_RUNNING
             # Ensure we don't resume a timer that already finished while paused
             if self._remaining_seconds > 0:
                  # Restart the GLib timer
-                self._timer_source_id = GLib.timeout_add_seconds(1, self._tick)
+                self._run_for(self._pause_remaining)
                 self.emit('timer_resumed')
                 # Emit current time immediately on resume
-                self.emit('timer_tick', self._remaining_seconds)
-                print(f"TimerManager: Resumed with {self._remaining_seconds} seconds.")
+                self._emit_tick(self._remaining_seconds)
+                log.info("Resumed with %s seconds.", self._remaining_seconds)
             else:
                  # This case shouldn't normally happen if pause stops ticks, but safety first
-                 print("TimerManager: Resume requested but remaining time is zero. Entering break state.")
+                 log.info("Resume requested but remaining time is zero. Entering break state.")
                  self._enter_break_state()
         else:
-            print(f"TimerManager: Cannot resume, not paused (state={self._state})")
+            log.debug("Cannot resume, not paused (state=%s)", self._state)
 
 
     def stop(self):
@@ -138,16 +212,17 @@ class TimerManager(GObject.Object):
             Resets remaining time based on configured interval for next start.
             Always emits 'timer_stopped' signal if the state changes to stopped.
             """
-            print("TimerManager: Stop requested.")
+            log.debug("Stop requested.")
             previous_state = self._state # Store previous state
             self._stop_internal_timer()
             self._state = self.STATE_STOPPED
+            self._deadline_monotonic = None
             # Reset remaining time for the next potential start
             self._remaining_seconds = self._configured_interval_seconds
             # Emit stopped signal if the state actually changed to stopped by this call
             if previous_state != self.STATE_STOPPED: # <--- This is the key condition
                  self.emit('timer_stopped')
-            print("TimerManager: Stopped.")
+            log.info("Stopped.")
 
     def postpone(self, minutes: float): # Allow float for fractions
         """
@@ -157,65 +232,119 @@ class TimerManager(GObject.Object):
             minutes: The postpone duration in minutes (e.g., 5/60 for 5s).
                      Must result in >= 1 second.
         """
-        print(f"TimerManager: Postpone requested for {minutes:.2f} minutes.")
-        self._stop_internal_timer() # Clear any existing timer source
+        self.postpone_seconds(self._minutes_to_seconds(minutes))
 
-        postpone_seconds = int(round(minutes * 60)) # Convert to seconds and round
+    def postpone_seconds(self, postpone_seconds: int):
+        """
+        Starts a shorter timer interval of whole seconds immediately.
+
+        Args:
+            postpone_seconds: The postpone duration in seconds (>= 1).
+        """
+        log.debug("Postpone requested for %s seconds.", postpone_seconds)
+
+        postpone_seconds = int(postpone_seconds)
         if postpone_seconds < 1:
-            print(f"Warning: Invalid postpone duration ({postpone_seconds}s from {minutes}min), using 1 second.", file=sys.stderr)
+            log.warning("Invalid postpone duration (%ss), using 1 second.", postpone_seconds)
             postpone_seconds = 1
 
         self._state = self.STATE_RUNNING
-        self._remaining_seconds = postpone_seconds
-        self._timer_source_id = GLib.timeout_add_seconds(1, self._tick)
+        self._run_for(postpone_seconds)
         # We reuse 'timer_started' for simplicity, could have a dedicated signal
         self.emit('timer_started')
         # Emit initial tick immediately
-        self.emit('timer_tick', self._remaining_seconds)
-        print(f"TimerManager: Postponed. Starting {self._remaining_seconds} second countdown.")
+        self._emit_tick(self._remaining_seconds)
+        log.info("Postponed. Starting %s second countdown.", self._remaining_seconds)
 
     # --- Private Methods ---
 
-    def _stop_internal_timer(self):
-        """Safely removes the GLib timer source if it exists."""
-        if self._timer_source_id:
-            GLib.source_remove(self._timer_source_id)
-            self._timer_source_id = None
-            # print("TimerManager: Internal GLib timer source stopped.")
-
+    @staticmethod
+    def _minutes_to_seconds(minutes: float) -> int:
+        """Converts minutes to whole seconds, warning if that had to round."""
+        seconds = minutes * 60
+        rounded = int(round(seconds))
+        if abs(seconds - rounded) > 1e-9:
+            log.warning("%s minutes is not a whole number of seconds, using %ss.", minutes, rounded)
+        return rounded
+
+    def _run_for(self, seconds: float):
+        """Sets the countdown deadline 'seconds' from now and schedules the first tick (replacing any pending one)."""
+        self._deadline_monotonic = time.monotonic() + seconds
+        self._remaining_seconds = self._quantize(seconds)
+        self._schedule_tick(seconds)
+
+    def _quantize(self, time_left: float) -> int:
+        """Rounds time_left (seconds) up to a whole tick period."""
+        period = self._tick_period
+        return math.ceil(time_left / period) * period
+
+    def _schedule_tick(self, time_left: float):
+        """
+        Schedules _tick just after the next whole-second (or whole-minute, see
+        __init__) boundary before the deadline, so late wakeups never
+        accumulate into drift.
 
-    def _tick(self) -> bool:
+        Args:
+            time_left: Seconds until the deadline, as just computed by the caller.
         """
-        Internal callback executed every second by GLib.timeout_add_seconds.
-        Decrements remaining time and checks for break condition.
+        # +1ms so we land after the boundary, not just before it. The source
+        # has microsecond precision (unlike timeout_add_seconds, whose
+        # wakeups GLib may shift within the second).
+        self._tick_source.wake_in(time_left % self._tick_period + 0.001)
+
+    def _stop_internal_timer(self):
+        """Cancels the pending tick, if any."""
+        self._tick_source.cancel()
 
-        Returns:
-            bool: True to keep the timer running, False to stop it.
+    def _tick(self):
         """
+        Internal callback executed about once a second, or once a minute with
+        minute_resolution (see _schedule_tick).
+        Recomputes the remaining time from the deadline and checks for break
+        condition.
+        """
+        # Common case first: running with time left
+        if self._state == self.STATE_RUNNING:
+            # Read the clock once; the same time_left feeds the remaining time
+            # and the next wakeup
+            time_left = self._deadline_monotonic - time.monotonic()
+            remaining = self._quantize(time_left)
+            if remaining > 0:
+                self._schedule_tick(time_left)
+                # GLib may wake us slightly early or late; only report actual changes
+                if remaining != self._remaining_seconds:
+                    self._remaining_seconds = remaining
+                    log.debug("Tick! Remaining: %ss", remaining)
+                    self._emit_tick(remaining)
+                return
+        self._slow_tick_path()
+
+    def _slow_tick_path(self):
+        """The rare _tick outcomes: the timer reached zero, or isn't running."""
         if self._state != self.STATE_RUNNING:
             # Should not happen if timer is managed correctly, but safety check
-            print("Warning: _tick called while not in RUNNING state.", file=sys.stderr)
-            self._timer_source_id = None # Ensure it stops
-            return False # Stop the timer
+            log.warning("_tick called while not in RUNNING state.")
+            return # No next tick is scheduled
+        log.debug("Timer reached zero.")
+        self._enter_break_state()
 
-        self._remaining_seconds -= 1
-        # print(f"TimerManager: Tick! Remaining: {self._remaining_seconds}s") # Debug print
-
-        if self._remaining_seconds > 0:
-            self.emit('timer_tick', self._remaining_seconds)
-            return True # Continue timer
-        else:
-            print("TimerManager: Timer reached zero.")
-            self._enter_break_state()
-            return False # Stop the timer (GLib.source_remove is implicit when False is returned)
+    def _emit_tick(self, remaining: int):
+        """
+        Calls the tick listeners and emits timer_tick, skipping the signal
+        machinery when no handler is connected.
+        """
+        for callback in self._tick_listeners:
+            callback(remaining)
+        if GObject.signal_has_handler_pending(self, _TICK_SIGNAL_ID, 0, False):
+            self.emit('timer_tick', remaining)
 
     def _enter_break_state(self):
         """Transitions the timer to the break state."""
         self._state = self.STATE_BREAK_ACTIVE
         self._remaining_seconds = 0 # Ensure it's exactly zero
-        self._timer_source_id = None # Timer source is automatically removed on returning False
+        self._deadline_monotonic = None # No next tick is scheduled
         self.emit('break_started')
-        print("TimerManager: Entered BREAK_ACTIVE state.")
+        log.info("Entered BREAK_ACTIVE state.")
 
 
     # --- Public property accessors (optional but good practice) ---
@@ -232,8 +361,12 @@ class TimerManager(GObject.Object):
          return self._configured_interval_seconds
 
 
+# Looked up once; see TimerManager._emit_tick
+_TICK_SIGNAL_ID = GObject.signal_lookup('timer_tick', TimerManager)
+
 # --- Test Code ---
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG, format="%(name)s: %(message)s")
     print("Running TimerManager Test...")
 
     main_loop = GLib.MainLoop()
@@ -1,7 +1,8 @@
 # File: tray_icon.py
 import sys
 import gi
-import math # For formatting time
+import logging
+import contextlib
 
 try:
     # Use AyatanaAppIndicator3 if available (standard on modern Ubuntu/Debian)
@@ -33,7 +34,9 @@ except ValueError as e:
      print(f"Error: Could not satisfy Gtk/GObject/GLib version requirement. {e}", file=sys.stderr)
      sys.exit(1)
 
-from gi.repository import Gtk, GObject, GLib
+from gi.repository import Gtk, GObject, GLib, Gio
+
+log = logging.getLogger(__name__)
 
 class TrayIcon(GObject.Object):
     """
@@ -56,6 +59,35 @@ class TrayIcon(GObject.Object):
     ICON_PAUSED = "media-playback-pause-symbolic"
     ICON_BREAK = "dialog-warning-symbolic" # Or 'user-idle-symbolic'
 
+    # What each state shows: (label, icon, dynamic item label, dynamic item
+    # action, dynamic item sensitive, "Pause for..." sensitive, "Set Time..."
+    # sensitive). Labels of the states in _TIMED_STATES are templates for the
+    # MM:SS remaining time.
+    _STATE_TABLE = {
+        # The dynamic item is disabled when running ("Running..." is display
+        # only); "Pause for..." and "Set Time..." are only available then
+        STATE_RUNNING: ("{} left", ICON_RUNNING, "Running...", "none", False, True, True),
+        STATE_PAUSED: ("Paused", ICON_PAUSED, "Resume Timer", "resume", True, False, False),
+        STATE_IDLE: ("Paused (Idle)", ICON_PAUSED, "Resume Timer", "resume", True, False, False),
+        STATE_BREAK: ("Break Time!", ICON_BREAK, "Start New Timer", "start", True, False, False), # Start after break
+        STATE_STOPPED: ("Stopped", ICON_DEFAULT, "Start Timer", "start", True, False, False),
+        STATE_MANUAL_PAUSE: ("Paused for {}", ICON_PAUSED, "Resume Now", "resume", True, False, False), # Allow manual resume
+    }
+    _TIMED_STATES = frozenset((STATE_RUNNING, STATE_MANUAL_PAUSE))
+    _UNKNOWN_STATE_ROW = ("MindfulBreak", ICON_DEFAULT, "Start Timer", "start", True, False, False)
+
+    # Prefix of the menu's action group ("tray.pause_for", ...)
+    _ACTION_PREFIX = "tray"
+
+    # Signal emitted by the dynamic item for each of its actions
+    _DYNAMIC_ACTION_SIGNALS = {
+        "start": 'start_timer_requested',
+        "resume": 'resume_timer_requested',
+    }
+
+    # "MM:SS" for every second of the first hour, built once
+    _MMSS = tuple(f"{s // 60:02d}:{s % 60:02d}" for s in range(3601))
+
     # Removed 'pause_timer_requested' signal
     __gsignals__ = {
         'start_timer_requested': (GObject.SignalFlags.RUN_FIRST, None, ()),
@@ -83,38 +115,45 @@ class TrayIcon(GObject.Object):
 
         self.indicator.set_status(AppIndicator3.IndicatorStatus.ACTIVE)
 
+        # Menu items are bound to actions; enabling/disabling an action
+        # updates its item's sensitivity
+        self._actions = Gio.SimpleActionGroup()
+        self._action_start_resume = self._add_action('start_resume', self._on_start_resume_activate)
+        self._action_pause_for = self._add_action('pause_for', self._on_action_activate, 'pause_for_requested')
+        self._action_set_time = self._add_action('set_time', self._on_action_activate, 'set_time_requested')
+        self._add_action('settings', self._on_action_activate, 'settings_requested')
+        self._add_action('quit', self._on_action_activate, 'quit_requested')
+
         # Build the menu
         self.menu = Gtk.Menu()
+        self.menu.insert_action_group(self._ACTION_PREFIX, self._actions)
 
         # --- Dynamic Item (Start/Resume/Start New) ---
         # This item no longer shows "Pause Timer"
-        self.item_start_resume = Gtk.MenuItem(label="Start Timer")
-        self.item_start_resume.connect('activate', self._on_start_resume_activate)
-        self.menu.append(self.item_start_resume)
+        self.item_start_resume = self._add_menu_item("Start Timer", 'start_resume')
         self._current_dynamic_action = 'start' # Tracks what this item does
+        # Values last pushed to the indicator/menu, so unchanged ones are skipped
+        self._last = {'label': None, 'icon': None, 'dyn_label': None, 'dyn_sens': None,
+                      'pf_sens': None, 'st_sens': None}
+        self._last_key = None # (state, remaining_seconds) last applied
+        self._batch_depth = 0 # Nesting level of batch()
+        self._pending = None # (state, remaining_seconds) deferred by batch()
+        self._silenced = False # True inside suppress()
 
         # --- Pause For... Item ---
-        self.item_pause_for = Gtk.MenuItem(label="Pause for...")
-        self.item_pause_for.connect('activate', self._on_pause_for_activate)
-        self.menu.append(self.item_pause_for)
+        self.item_pause_for = self._add_menu_item("Pause for...", 'pause_for')
 
         # --- Set Time... Item ---
-        self.item_set_time = Gtk.MenuItem(label="Set Time...")
-        self.item_set_time.connect('activate', self._on_set_time_activate)
-        self.menu.append(self.item_set_time)        
+        self.item_set_time = self._add_menu_item("Set Time...", 'set_time')
 
         # --- Separator ---
         self.menu.append(Gtk.SeparatorMenuItem())
 
         # --- Settings ---
-        item_settings = Gtk.MenuItem(label="Settings")
-        item_settings.connect('activate', self._on_settings_activate)
-        self.menu.append(item_settings)
+        self._add_menu_item("Settings", 'settings')
 
         # --- Quit ---
-        item_quit = Gtk.MenuItem(label="Quit")
-        item_quit.connect('activate', self._on_quit_activate)
-        self.menu.append(item_quit)
+        self._add_menu_item("Quit", 'quit')
 
         self.menu.show_all()
         self.indicator.set_menu(self.menu)
@@ -122,9 +161,47 @@ class TrayIcon(GObject.Object):
         # Set initial visual state
         self.update_status(self.STATE_STOPPED)
 
-        print(f"TrayIcon: Initialized with ID '{indicator_id}'")
+        log.info("Initialized with ID '%s'", indicator_id)
 
 
+    def _add_action(self, name, callback, *user_data) -> Gio.SimpleAction:
+        """Adds a parameterless action to the menu's action group and returns it."""
+        action = Gio.SimpleAction.new(name, None)
+        action.connect('activate', callback, *user_data)
+        self._actions.add_action(action)
+        return action
+
+    def _add_menu_item(self, label, action_name) -> Gtk.MenuItem:
+        """Appends a menu item bound to one of our actions and returns it."""
+        item = Gtk.MenuItem(label=label)
+        item.set_action_name(f"{self._ACTION_PREFIX}.{action_name}")
+        self.menu.append(item)
+        return item
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Context manager that defers update_status calls until the (outermost)
+        block exits, then applies only the last one.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._pending is not None:
+                pending, self._pending = self._pending, None
+                self._apply_status(*pending)
+
+    @contextlib.contextmanager
+    def suppress(self):
+        """Context manager that drops all update_status calls made inside it."""
+        previous, self._silenced = self._silenced, True
+        try:
+            yield self
+        finally:
+            self._silenced = previous
+
     def update_status(self, state: str, remaining_seconds: int = 0):
         """
         Updates the indicator icon and label based on the provided state.
@@ -134,112 +211,85 @@ class TrayIcon(GObject.Object):
             state: The current state (use STATE_* constants).
             remaining_seconds: Time left, used when state is RUNNING or MANUAL_PAUSE.
         """
-        label = "MindfulBreak" # Default label
-        icon_name = self.ICON_DEFAULT
-        dynamic_label = "Start Timer"
-        dynamic_action = "start"
-        dynamic_sensitive = True
-        pause_for_sensitive = False # "Pause for..." only available when running
-        set_time_sensitive = False # "Set Time..." only available when running        
-
-        if state == self.STATE_RUNNING:
-            minutes = remaining_seconds // 60
-            seconds = remaining_seconds % 60
-            # --- Change: Always format as MM:SS ---
-            label = f"{minutes:02d}:{seconds:02d} left"
-            # --- End Change ---
-            icon_name = self.ICON_RUNNING
-            # Option 2: Disable the dynamic item when running
-            dynamic_label = "Running..." # Display only, not clickable
-            dynamic_action = "none"      # Custom action type
-            dynamic_sensitive = False    # Disable it
-            pause_for_sensitive = True   # Enable "Pause for..." when running
-            set_time_sensitive = True    # Enable "Set Time..." when running            
-
-        elif state == self.STATE_PAUSED:
-            label = "Paused"
-            icon_name = self.ICON_PAUSED
-            dynamic_label = "Resume Timer"
-            dynamic_action = "resume"
-
-        elif state == self.STATE_IDLE:
-            label = "Paused (Idle)"
-            icon_name = self.ICON_PAUSED
-            dynamic_label = "Resume Timer"
-            dynamic_action = "resume"
-
-        elif state == self.STATE_BREAK:
-            label = "Break Time!"
-            icon_name = self.ICON_BREAK
-            dynamic_label = "Start New Timer" # Start after break
-            dynamic_action = "start"
-
-        elif state == self.STATE_STOPPED:
-            label = "Stopped"
-            icon_name = self.ICON_DEFAULT
-            dynamic_label = "Start Timer"
-            dynamic_action = "start"
-
-        elif state == self.STATE_MANUAL_PAUSE:
-             minutes = remaining_seconds // 60
-             seconds = remaining_seconds % 60
-             # --- Change: Format manual pause as MM:SS too ---
-             label = f"Paused for {minutes:02d}:{seconds:02d}"
-             # --- End Change ---
-             icon_name = self.ICON_PAUSED
-             dynamic_label = "Resume Now" # Allow manual resume
-             dynamic_action = "resume"
-
-        else:
-             print(f"Warning: Unknown state '{state}' in update_status.", file=sys.stderr)
-
-        # Apply updates (remains same)
-        self.indicator.set_label(label, "")
-        self.indicator.set_icon_full(icon_name, label)
-
-        self.item_start_resume.set_label(dynamic_label)
-        self.item_start_resume.set_sensitive(dynamic_sensitive)
+        if self._silenced:
+            return
+        if self._batch_depth:
+            self._pending = (state, remaining_seconds) # Last one wins
+            return
+        self._apply_status(state, remaining_seconds)
+
+    def _apply_status(self, state: str, remaining_seconds: int):
+        """Pushes the status to the indicator and menu (see update_status)."""
+        # Repeated calls with the same arguments (e.g. a state change followed
+        # by its first tick) have nothing to apply
+        key = (state, remaining_seconds)
+        if key == self._last_key:
+            return
+        self._last_key = key
+
+        row = self._STATE_TABLE.get(state)
+        if row is None:
+            log.warning("Unknown state '%s' in update_status.", state)
+            row = self._UNKNOWN_STATE_ROW
+        (label, icon_name, dynamic_label, dynamic_action, dynamic_sensitive,
+         pause_for_sensitive, set_time_sensitive) = row
+        if state in self._TIMED_STATES:
+            label = label.format(self._format_mmss(remaining_seconds)) # Always MM:SS
+
+        # Apply updates. Each call crosses into GTK (and usually D-Bus for the
+        # indicator), and while running only the label changes every second,
+        # so only push values that differ from the last ones
+        last = self._last
+        if label != last['label']:
+            self.indicator.set_label(label, "")
+        if icon_name != last['icon'] or label != last['label']:
+            self.indicator.set_icon_full(icon_name, label) # label is the accessible description
+            last['icon'] = icon_name
+        last['label'] = label
+
+        if dynamic_label != last['dyn_label']:
+            self.item_start_resume.set_label(dynamic_label)
+            last['dyn_label'] = dynamic_label
+        if dynamic_sensitive != last['dyn_sens']:
+            self._action_start_resume.set_enabled(dynamic_sensitive)
+            last['dyn_sens'] = dynamic_sensitive
         self._current_dynamic_action = dynamic_action
 
-        self.item_pause_for.set_sensitive(pause_for_sensitive)
-        self.item_set_time.set_sensitive(set_time_sensitive)        
+        if pause_for_sensitive != last['pf_sens']:
+            self._action_pause_for.set_enabled(pause_for_sensitive)
+            last['pf_sens'] = pause_for_sensitive
+        if set_time_sensitive != last['st_sens']:
+            self._action_set_time.set_enabled(set_time_sensitive)
+            last['st_sens'] = set_time_sensitive
+
+        log.debug("Updated - State=%s, Label='%s', Icon='%s', DynAction='%s'", state, label, icon_name, dynamic_action)
 
-        # print(f"TrayIcon: Updated - State={state}, Label='{label}', Icon='{icon_name}', DynAction='{dynamic_action}'")
+    def _format_mmss(self, remaining_seconds: int) -> str:
+        """Formats remaining_seconds (negative counts as 0) as MM:SS (minutes may exceed 59)."""
+        remaining_seconds = max(0, remaining_seconds)
+        if remaining_seconds < len(self._MMSS):
+            return self._MMSS[remaining_seconds]
+        minutes, seconds = divmod(remaining_seconds, 60)
+        return f"{minutes:02d}:{seconds:02d}"
 
     # --- Signal Emitters for Menu Actions ---
-    def _on_start_resume_activate(self, widget):
+    def _on_start_resume_activate(self, action, parameter):
         """Callback for the dynamic start/resume menu item."""
-        if self._current_dynamic_action == "start":
-            print("TrayIcon: Start action requested.")
-            self.emit('start_timer_requested')
-        elif self._current_dynamic_action == "resume":
-            print("TrayIcon: Resume action requested.")
-            self.emit('resume_timer_requested')
-        elif self._current_dynamic_action == "none":
-             # Action when item is disabled (e.g., "Running...")
-             pass
-        else:
-             print(f"TrayIcon: Unknown dynamic action '{self._current_dynamic_action}'")
-
-    def _on_pause_for_activate(self, widget):
-        print("TrayIcon: Pause for... action requested.")
-        self.emit('pause_for_requested')
-
-    def _on_set_time_activate(self, widget):
-        print("TrayIcon: Set Time... action requested.")
-        self.emit('set_time_requested')
-
-    def _on_settings_activate(self, widget):
-        print("TrayIcon: Settings action requested.")
-        self.emit('settings_requested')
-
-    def _on_quit_activate(self, widget):
-        print("TrayIcon: Quit action requested.")
-        self.emit('quit_requested')
+        signal_name = self._DYNAMIC_ACTION_SIGNALS.get(self._current_dynamic_action)
+        if signal_name is not None:
+            self._on_action_activate(action, parameter, signal_name)
+        elif self._current_dynamic_action != "none": # "none": item is disabled (e.g., "Running...")
+             log.warning("Unknown dynamic action '%s'", self._current_dynamic_action)
+
+    def _on_action_activate(self, action, parameter, signal_name):
+        """Shared callback for the menu actions; emits the item's request signal."""
+        log.debug("Menu action requested: %s", signal_name)
+        self.emit(signal_name)
 
 
 # --- Test Code (Minimal - uncomment and adapt if needed) ---
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG, format="%(name)s: %(message)s")
     print("Running TrayIcon Test...")
     print("This test code is minimal. Run the main application for full testing.")
     # Example of how to test the new state manually: